@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Catalog of the skills, agents and commands in this configuration
+
+Reads the frontmatter of skills/*/SKILL.md, agents/*.md and commands/*.md
+(with the parser from skills/skill-creator/scripts/quick_validate.py) and
+compiles it into one JSON file, so listing or selecting them costs a single
+small file read instead of opening and parsing every file. Rebuilding only
+re-parses files whose size or mtime changed and whose SHA-256 differs from
+the cataloged copy; removed files are dropped.
+
+Usage:
+    catalog.py build [--rebuild]
+    catalog.py list [--kind skill|agent|command] [--json]
+    catalog.py show <name> [--kind KIND]
+    catalog.py search <words>... [--kind KIND]
+
+Lookups read the catalog as is; pass --refresh to bring it up to date first.
+"""
+
+import os
+import sys
+import json
+import hashlib
+import argparse
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).parent
+sys.path.insert(0, str(ROOT / "skills" / "skill-creator" / "scripts"))
+
+from quick_validate import read_frontmatter
+
+CATALOG_VERSION = 1
+
+# kind -> glob, relative to the configuration root
+SOURCES = {
+    "skill": "skills/*/SKILL.md",
+    "agent": "agents/*.md",
+    "command": "commands/*.md",
+}
+
+# Frontmatter key holding the tool list, per kind
+TOOLS_KEYS = {"skill": "allowed-tools", "agent": "tools", "command": "allowed-tools"}
+
+
+def catalog_path(root=ROOT):
+    """Location of the catalog, kept at the configuration root"""
+    return Path(root) / "catalog.json"
+
+
+def split_tools(value):
+    """Split a comma-separated tool list, keeping "Bash(a, b)" patterns whole"""
+    if isinstance(value, list):
+        return [str(tool).strip() for tool in value if str(tool).strip()]
+    if not isinstance(value, str):
+        return []
+    tools = []
+    depth = 0
+    current = ""
+    for char in value:
+        if char == "," and depth == 0:
+            tools.append(current.strip())
+            current = ""
+            continue
+        depth += (char == "(") - (char == ")")
+        current += char
+    tools.append(current.strip())
+    return [tool for tool in tools if tool]
+
+
+def read_entry(kind, file, root):
+    """Catalog entry for one file, from its frontmatter"""
+    frontmatter, error = read_frontmatter(file, lenient=True)
+    frontmatter = frontmatter or {}
+    default_name = file.parent.name if kind == "skill" else file.stem
+    name = frontmatter.get("name")
+    description = frontmatter.get("description")
+    return {
+        "kind": kind,
+        "name": name.strip() if isinstance(name, str) and name.strip() else default_name,
+        "path": file.relative_to(root).as_posix(),
+        "description": " ".join(description.split()) if isinstance(description, str) else "",
+        "tools": split_tools(frontmatter.get(TOOLS_KEYS[kind])),
+        "argument_hint": str(frontmatter.get("argument-hint") or ""),
+        "model": str(frontmatter.get("model") or ""),
+        "error": error,
+    }
+
+
+def valid_entry(entry):
+    """True if entry has every field build_catalog writes, with the right types"""
+    if not isinstance(entry, dict):
+        return False
+    if not all(isinstance(entry.get(key), str)
+               for key in ("kind", "name", "path", "description", "argument_hint", "model", "sha256")):
+        return False
+    return (entry["kind"] in SOURCES
+            and isinstance(entry.get("tools"), list)
+            and isinstance(entry.get("mtime_ns"), int)
+            and isinstance(entry.get("size"), int)
+            and (entry.get("error") is None or isinstance(entry["error"], str)))
+
+
+def load_catalog(root=ROOT, path=None):
+    """Read the catalog file; returns its entries, or None if missing, outdated or malformed"""
+    try:
+        with open(path or catalog_path(root), "r", encoding="utf-8") as f:
+            catalog = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(catalog, dict) or catalog.get("version") != CATALOG_VERSION:
+        return None
+    entries = catalog.get("entries")
+    # A truncated or hand-edited catalog is rebuilt rather than half-trusted
+    if not isinstance(entries, list) or not all(valid_entry(entry) for entry in entries):
+        return None
+    return entries
+
+
+def build_catalog(root=ROOT, path=None, rebuild=False):
+    """Bring the catalog in line with the files under root
+
+    Returns (entries, parsed, removed). The catalog file is only rewritten
+    when something changed.
+    """
+    root = Path(root)
+    path = Path(path or catalog_path(root))
+    previous_entries = None if rebuild else load_catalog(root, path)
+    known = {entry["path"]: entry for entry in previous_entries or []}
+    entries = []
+    parsed = 0
+    changed = previous_entries is None
+
+    for kind, pattern in SOURCES.items():
+        for file in sorted(root.glob(pattern)):
+            relative = file.relative_to(root).as_posix()
+            stat = file.stat()
+            previous = known.pop(relative, None)
+            if previous and previous["mtime_ns"] == stat.st_mtime_ns and previous["size"] == stat.st_size:
+                entries.append(previous)
+                continue
+
+            data = file.read_bytes()
+            sha256 = hashlib.sha256(data).hexdigest()
+            if previous and previous["sha256"] == sha256:
+                entry = previous
+            else:
+                entry = read_entry(kind, file, root)
+                parsed += 1
+            entry.update(mtime_ns=stat.st_mtime_ns, size=stat.st_size, sha256=sha256)
+            entries.append(entry)
+            changed = True
+
+    removed = len(known)
+    if changed or removed:
+        write_catalog(path, entries)
+    return entries, parsed, removed
+
+
+def write_catalog(path, entries):
+    """Atomically replace the catalog file"""
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"version": CATALOG_VERSION, "entries": entries}, f, indent=1)
+            f.write("\n")
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def get_entries(root=ROOT, kind=None, refresh=False):
+    """All catalog entries, optionally of one kind
+
+    Builds the catalog if it does not exist yet. With refresh=True, changed
+    files are re-read first.
+    """
+    entries = None if refresh else load_catalog(root)
+    if entries is None:
+        entries = build_catalog(root)[0]
+    return [entry for entry in entries if kind is None or entry["kind"] == kind]
+
+
+def lookup(name, kind=None, root=ROOT, refresh=False):
+    """The entry with this name (or file stem), or None"""
+    for entry in get_entries(root, kind, refresh):
+        if entry["name"] == name or Path(entry["path"]).stem == name:
+            return entry
+    return None
+
+
+def search(words, kind=None, root=ROOT, refresh=False):
+    """Entries whose name or description contains every word, name matches first"""
+    words = [word.lower() for word in words]
+    hits = []
+    for entry in get_entries(root, kind, refresh):
+        text = f"{entry['name']} {entry['description']}".lower()
+        if all(word in text for word in words):
+            in_name = sum(word in entry["name"].lower() for word in words)
+            hits.append((-in_name, entry["kind"], entry["name"], entry))
+    return [entry for *_, entry in sorted(hits, key=lambda hit: hit[:3])]
+
+
+def print_entries(entries):
+    width = max((len(entry["name"]) for entry in entries), default=0)
+    for entry in entries:
+        description = entry["description"]
+        if len(description) > 90:
+            description = description[:87] + "..."
+        print(f"{entry['kind']:<8} {entry['name']:<{width}}  {description}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="List and look up skills, agents and commands.")
+    parser.add_argument("--root", default=str(ROOT), help=f"configuration root (default: {ROOT})")
+    parser.add_argument("--refresh", action="store_true", help="update the catalog before a lookup")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = commands.add_parser("build", help="update the catalog from the files")
+    build_parser.add_argument("--rebuild", action="store_true", help="re-read every file")
+    list_parser = commands.add_parser("list", help="list cataloged entries")
+    list_parser.add_argument("--kind", choices=SOURCES)
+    list_parser.add_argument("--json", action="store_true", help="print the entries as JSON")
+    show_parser = commands.add_parser("show", help="print one entry as JSON")
+    show_parser.add_argument("name")
+    show_parser.add_argument("--kind", choices=SOURCES)
+    search_parser = commands.add_parser("search", help="find entries by name or description")
+    search_parser.add_argument("words", nargs="+")
+    search_parser.add_argument("--kind", choices=SOURCES)
+
+    args = parser.parse_args()
+    root = Path(args.root)
+
+    if args.command == "build":
+        entries, parsed, removed = build_catalog(root, rebuild=args.rebuild)
+        print(f"Cataloged {len(entries)} entries ({parsed} parsed, {removed} removed) in {catalog_path(root)}")
+        for entry in entries:
+            if entry["error"]:
+                print(f"  {entry['path']}: {entry['error']}")
+        return 0
+
+    if args.command == "list":
+        entries = get_entries(root, args.kind, args.refresh)
+        if args.json:
+            print(json.dumps(entries, indent=2))
+        else:
+            print_entries(entries)
+        return 0
+
+    if args.command == "show":
+        entry = lookup(args.name, args.kind, root, args.refresh)
+        if entry is None:
+            print(f"Error: no {args.kind or 'entry'} named {args.name!r}", file=sys.stderr)
+            return 1
+        print(json.dumps(entry, indent=2))
+        return 0
+
+    hits = search(args.words, args.kind, root, args.refresh)
+    print_entries(hits)
+    return 0 if hits else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Full-text search index over the synced documentation
+
+Splits every page in DOCS_DIR into sections at markdown headings and stores
+them in a SQLite FTS5 table, so a query returns ranked sections with their
+file and line range instead of grepping and re-reading whole pages.
+sync-docs.py updates the index after each run; only pages whose file changed
+since the last update are re-indexed.
+
+Usage:
+    docs_index.py search <query> [-n LIMIT]
+    docs_index.py build [--rebuild]
+
+Queries use FTS5 syntax: words are ANDed, "quoted phrases", OR, prefix*.
+"""
+
+import sys
+import time
+import sqlite3
+import hashlib
+import argparse
+from pathlib import Path
+
+DOCS_DIR = Path(__file__).parent / "docs"
+SCHEMA_VERSION = 1
+
+# Column weights for bm25(): matches in a heading count more than in the body
+HEADING_WEIGHT = 4.0
+BODY_WEIGHT = 1.0
+
+
+def index_path(docs_dir=DOCS_DIR):
+    """Location of the index, kept next to the docs directory"""
+    docs_dir = Path(docs_dir)
+    return docs_dir.parent / f"{docs_dir.name}-index.sqlite"
+
+
+def connect(db_path):
+    """Open the index, creating the schema if needed"""
+    conn = sqlite3.connect(str(db_path))
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    if version != SCHEMA_VERSION:
+        conn.executescript("""
+            DROP TABLE IF EXISTS pages;
+            DROP TABLE IF EXISTS sections;
+            CREATE TABLE pages (
+                name TEXT PRIMARY KEY,
+                mtime_ns INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                sha256 TEXT NOT NULL
+            );
+            CREATE VIRTUAL TABLE sections USING fts5(
+                page UNINDEXED,
+                heading,
+                body,
+                line_start UNINDEXED,
+                line_end UNINDEXED,
+                tokenize = 'porter unicode61'
+            );
+        """)
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        conn.commit()
+    return conn
+
+
+def split_sections(text):
+    """Split markdown into (heading_path, body, line_start, line_end) sections
+
+    Headings inside fenced code blocks are ignored. heading_path joins the
+    enclosing headings, e.g. "Hooks > PreToolUse > Matchers". Lines are 1-based.
+    """
+    sections = []
+    trail = []  # (level, title) of the enclosing headings
+    heading = ""
+    body = []
+    start = 1
+    in_fence = False
+
+    def flush(end):
+        if heading or any(line.strip() for line in body):
+            sections.append((heading, "\n".join(body), start, end))
+
+    lines = text.splitlines()
+    for number, line in enumerate(lines, 1):
+        stripped = line.lstrip()
+        if stripped.startswith("```") or stripped.startswith("~~~"):
+            in_fence = not in_fence
+        elif not in_fence and line.startswith("#"):
+            level = len(line) - len(line.lstrip("#"))
+            title = line[level:].strip()
+            if 1 <= level <= 6 and title and line[level:level + 1] in (" ", "\t"):
+                flush(number - 1)
+                while trail and trail[-1][0] >= level:
+                    trail.pop()
+                trail.append((level, title))
+                heading = " > ".join(t for _, t in trail)
+                body = []
+                start = number
+                continue
+        body.append(line)
+    flush(len(lines))
+    return sections
+
+
+def update_index(docs_dir=DOCS_DIR, db_path=None, rebuild=False):
+    """Bring the index in line with the docs directory
+
+    Pages are re-indexed only when their size or mtime changed and their
+    SHA-256 differs from the indexed copy; pages whose file is gone are dropped.
+
+    Returns (pages_indexed, sections_indexed, pages_removed).
+    """
+    docs_dir = Path(docs_dir)
+    conn = connect(db_path or index_path(docs_dir))
+    try:
+        if rebuild:
+            conn.execute("DELETE FROM pages")
+            conn.execute("DELETE FROM sections")
+
+        known = {name: (mtime_ns, size, sha256)
+                 for name, mtime_ns, size, sha256 in conn.execute("SELECT name, mtime_ns, size, sha256 FROM pages")}
+        present = set()
+        pages_indexed = sections_indexed = 0
+
+        for file in sorted(docs_dir.glob("*.md")):
+            name = file.stem
+            present.add(name)
+            stat = file.stat()
+            previous = known.get(name)
+            if previous and previous[0] == stat.st_mtime_ns and previous[1] == stat.st_size:
+                continue
+
+            data = file.read_bytes()
+            sha256 = hashlib.sha256(data).hexdigest()
+            if previous and previous[2] == sha256:
+                conn.execute("UPDATE pages SET mtime_ns = ?, size = ? WHERE name = ?",
+                             (stat.st_mtime_ns, stat.st_size, name))
+                continue
+
+            sections = split_sections(data.decode("utf-8", errors="replace"))
+            conn.execute("DELETE FROM sections WHERE page = ?", (name,))
+            conn.executemany(
+                "INSERT INTO sections (page, heading, body, line_start, line_end) VALUES (?, ?, ?, ?, ?)",
+                [(name, heading, body, line_start, line_end) for heading, body, line_start, line_end in sections]
+            )
+            conn.execute("INSERT OR REPLACE INTO pages (name, mtime_ns, size, sha256) VALUES (?, ?, ?, ?)",
+                         (name, stat.st_mtime_ns, stat.st_size, sha256))
+            pages_indexed += 1
+            sections_indexed += len(sections)
+
+        removed = [name for name in known if name not in present]
+        for name in removed:
+            conn.execute("DELETE FROM sections WHERE page = ?", (name,))
+            conn.execute("DELETE FROM pages WHERE name = ?", (name,))
+
+        conn.commit()
+        return pages_indexed, sections_indexed, len(removed)
+    finally:
+        conn.close()
+
+
+def search(query, docs_dir=DOCS_DIR, db_path=None, limit=10):
+    """Return ranked section hits for an FTS5 query
+
+    Each hit is a dict with page, file, heading, line_start, line_end, score
+    (lower is better, as reported by bm25) and snippet.
+    """
+    docs_dir = Path(docs_dir)
+    conn = connect(db_path or index_path(docs_dir))
+    try:
+        rows = conn.execute(
+            f"""
+            SELECT page, heading, line_start, line_end,
+                   bm25(sections, 0, {HEADING_WEIGHT}, {BODY_WEIGHT}, 0, 0) AS score,
+                   snippet(sections, 2, '[', ']', ' ... ', 12)
+            FROM sections
+            WHERE sections MATCH ?
+            ORDER BY score
+            LIMIT ?
+            """,
+            (query, limit)
+        ).fetchall()
+    finally:
+        conn.close()
+    return [
+        {
+            "page": page,
+            "file": str(docs_dir / f"{page}.md"),
+            "heading": heading,
+            "line_start": line_start,
+            "line_end": line_end,
+            "score": round(score, 3),
+            "snippet": " ".join(snippet.split()),
+        }
+        for page, heading, line_start, line_end, score, snippet in rows
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Search the synced Claude Code documentation.")
+    parser.add_argument("--docs-dir", default=str(DOCS_DIR), help=f"docs directory (default: {DOCS_DIR})")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    search_parser = commands.add_parser("search", help="query the index")
+    search_parser.add_argument("query", nargs="+", help="FTS5 query")
+    search_parser.add_argument("-n", "--limit", type=int, default=10, help="maximum hits (default: 10)")
+
+    build_parser = commands.add_parser("build", help="update the index from the docs directory")
+    build_parser.add_argument("--rebuild", action="store_true", help="re-index every page")
+
+    args = parser.parse_args()
+    docs_dir = Path(args.docs_dir)
+
+    started = time.perf_counter()
+    try:
+        if args.command == "build":
+            pages, sections, removed = update_index(docs_dir, rebuild=args.rebuild)
+            elapsed = (time.perf_counter() - started) * 1000
+            print(f"Indexed {pages} changed pages ({sections} sections), removed {removed} in {elapsed:.0f} ms")
+            return 0
+
+        hits = search(" ".join(args.query), docs_dir, limit=args.limit)
+    except sqlite3.OperationalError as e:
+        print(f"Error: {e}")
+        return 1
+    elapsed = (time.perf_counter() - started) * 1000
+
+    for hit in hits:
+        print(f"{hit['file']}:{hit['line_start']}-{hit['line_end']}  {hit['heading'] or '(top)'}  [{hit['score']}]")
+        print(f"    {hit['snippet']}")
+    print(f"\n{len(hits)} hit(s) in {elapsed:.1f} ms")
+    return 0 if hits else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
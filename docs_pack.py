@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Single-file compressed store for the synced documentation
+
+Packs every page in DOCS_DIR into one file. Each page is cut at its markdown
+headings and every section is deflate-compressed on its own, with an offset
+table at the end of the file, so a reader can mmap the pack and decompress a
+single page or a single section without touching the rest. Loading the whole
+corpus is one file open instead of one per page.
+
+Layout:
+    header   "DOCPACK1", version, page count, index offset, index length
+    blobs    deflate-compressed sections, back to back
+    index    deflate-compressed JSON: pages -> sections -> (offset, length)
+
+Usage:
+    docs_pack.py build [--level N]
+    docs_pack.py list [page]
+    docs_pack.py cat <page> [--section HEADING]
+    docs_pack.py export <directory>
+"""
+
+import os
+import sys
+import json
+import mmap
+import zlib
+import struct
+import argparse
+import tempfile
+from pathlib import Path
+
+from docs_index import split_sections
+
+DOCS_DIR = Path(__file__).parent / "docs"
+MAGIC = b"DOCPACK1"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<8sIIQQ")
+DEFAULT_LEVEL = 6
+
+
+def pack_path(docs_dir=DOCS_DIR):
+    """Location of the pack, kept next to the docs directory"""
+    docs_dir = Path(docs_dir)
+    return docs_dir.parent / f"{docs_dir.name}.pack"
+
+
+def cut_sections(text):
+    """Cut a page into contiguous (heading, line_start, line_end, text) chunks
+
+    Chunk boundaries are the heading lines found by docs_index.split_sections,
+    and the chunks concatenate back to exactly the original text.
+    """
+    lines = text.splitlines(keepends=True)
+    starts = []
+    for heading, _, line_start, _ in split_sections(text):
+        if heading and (not starts or line_start > starts[-1][1]):
+            starts.append((heading, line_start))
+    if not starts or starts[0][1] != 1:
+        starts.insert(0, ("", 1))
+
+    chunks = []
+    for i, (heading, line_start) in enumerate(starts):
+        line_end = starts[i + 1][1] - 1 if i + 1 < len(starts) else len(lines)
+        chunks.append((heading, line_start, line_end, "".join(lines[line_start - 1:line_end])))
+    return chunks
+
+
+def build_pack(docs_dir=DOCS_DIR, output=None, level=DEFAULT_LEVEL):
+    """Write every page of docs_dir into a pack, atomically replacing any old one
+
+    Returns (pages, sections, raw_bytes, packed_bytes).
+    """
+    docs_dir = Path(docs_dir)
+    output = Path(output or pack_path(docs_dir))
+    index = {}
+    raw_bytes = 0
+
+    fd, tmp_path = tempfile.mkstemp(dir=output.parent, prefix=f".{output.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(b"\0" * HEADER.size)  # Patched once the index offset is known
+            offset = HEADER.size
+            for file in sorted(docs_dir.glob("*.md")):
+                # surrogateescape keeps any invalid UTF-8 byte-exact through the round trip
+                text = file.read_bytes().decode("utf-8", errors="surrogateescape")
+                sections = []
+                for heading, line_start, line_end, chunk in cut_sections(text):
+                    data = chunk.encode("utf-8", errors="surrogateescape")
+                    blob = zlib.compress(data, level)
+                    f.write(blob)
+                    sections.append([heading, line_start, line_end, offset, len(blob), len(data)])
+                    offset += len(blob)
+                    raw_bytes += len(data)
+                index[file.stem] = sections
+
+            index_blob = zlib.compress(json.dumps(index, separators=(",", ":")).encode("utf-8"), level)
+            f.write(index_blob)
+            f.seek(0)
+            f.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(index), offset, len(index_blob)))
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, output)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+    section_count = sum(len(sections) for sections in index.values())
+    return len(index), section_count, raw_bytes, output.stat().st_size
+
+
+class DocsPack:
+    """Random-access reader for a docs pack
+
+    The file is memory-mapped; only the sections that are read get
+    decompressed. Use as a context manager or call close().
+    """
+
+    def __init__(self, path=None):
+        self.path = Path(path or pack_path())
+        self._file = open(self.path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, count, index_offset, index_length = HEADER.unpack_from(self._map, 0)
+            if magic != MAGIC or version != FORMAT_VERSION:
+                raise ValueError(f"{self.path} is not a version {FORMAT_VERSION} docs pack")
+            self._index = json.loads(zlib.decompress(self._map[index_offset:index_offset + index_length]))
+        except BaseException:
+            self.close()
+            raise
+
+    def close(self):
+        if getattr(self, "_map", None) is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __contains__(self, page):
+        return page in self._index
+
+    def pages(self):
+        """Names of all packed pages, sorted"""
+        return list(self._index)
+
+    def sections(self, page):
+        """(heading, line_start, line_end) of each section of a page"""
+        return [(heading, line_start, line_end) for heading, line_start, line_end, *_ in self._index[page]]
+
+    def _read(self, entry):
+        offset, length = entry[3], entry[4]
+        return zlib.decompress(self._map[offset:offset + length]).decode("utf-8", errors="surrogateescape")
+
+    def read_page(self, page):
+        """Full text of a page"""
+        return "".join(self._read(entry) for entry in self._index[page])
+
+    def read_section(self, page, heading):
+        """Text of one section, by heading path (e.g. "Hooks > PreToolUse") or index"""
+        entries = self._index[page]
+        if isinstance(heading, int):
+            return self._read(entries[heading])
+        for entry in entries:
+            if entry[0] == heading:
+                return self._read(entry)
+        # Fall back to the last component so "PreToolUse" finds "Hooks > PreToolUse"
+        for entry in entries:
+            if entry[0].rsplit(" > ", 1)[-1] == heading:
+                return self._read(entry)
+        raise KeyError(f"{page}: no section {heading!r}")
+
+    def export(self, directory):
+        """Write every page back out as a plain .md file; returns the count"""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        for page in self._index:
+            (directory / f"{page}.md").write_bytes(
+                self.read_page(page).encode("utf-8", errors="surrogateescape"))
+        return len(self._index)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pack the synced docs into one compressed file.")
+    parser.add_argument("--docs-dir", default=str(DOCS_DIR), help=f"docs directory (default: {DOCS_DIR})")
+    parser.add_argument("--pack", help="pack file (default: next to the docs directory)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = commands.add_parser("build", help="pack the docs directory")
+    build_parser.add_argument("--level", type=int, default=DEFAULT_LEVEL, choices=range(0, 10),
+                              metavar="0-9", help=f"deflate level (default: {DEFAULT_LEVEL})")
+    list_parser = commands.add_parser("list", help="list pages, or the sections of one page")
+    list_parser.add_argument("page", nargs="?")
+    cat_parser = commands.add_parser("cat", help="print a page or one of its sections")
+    cat_parser.add_argument("page")
+    cat_parser.add_argument("--section", help="heading path or last heading component")
+    export_parser = commands.add_parser("export", help="write the packed pages back out as .md files")
+    export_parser.add_argument("directory")
+
+    args = parser.parse_args()
+    path = Path(args.pack) if args.pack else pack_path(args.docs_dir)
+
+    if args.command == "build":
+        pages, sections, raw_bytes, packed_bytes = build_pack(args.docs_dir, path, args.level)
+        print(f"Packed {pages} pages ({sections} sections) into {path}: "
+              f"{raw_bytes:,} -> {packed_bytes:,} bytes")
+        return 0
+
+    try:
+        with DocsPack(path) as pack:
+            if args.command == "list":
+                if args.page:
+                    for heading, line_start, line_end in pack.sections(args.page):
+                        print(f"{line_start}-{line_end}  {heading or '(top)'}")
+                else:
+                    print("\n".join(pack.pages()))
+            elif args.command == "cat":
+                if args.section:
+                    sys.stdout.write(pack.read_section(args.page, args.section))
+                else:
+                    sys.stdout.write(pack.read_page(args.page))
+            elif args.command == "export":
+                count = pack.export(args.directory)
+                print(f"Exported {count} pages to {args.directory}")
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
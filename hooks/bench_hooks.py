@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+Hook latency benchmark.
+
+Replays a corpus of realistic PreToolUse/PostToolUse payloads through each
+guard and reports, per guard and payload:
+- cold start: the guard script run as a fresh interpreter, as settings.json
+  used to invoke it
+- in-process: the raw payload bytes handed to the guard in an already-warm
+  process, as the hook server does (including any prefilter() fast path)
+- p50/p95/p99 latency in milliseconds and peak memory (child max RSS for
+  cold starts, measured inside the child where the OS reports it;
+  tracemalloc peak for in-process)
+
+Usage:
+    bench_hooks.py [--runs N] [--cold-runs N] [--guard NAME]... [--output results.json]
+                   [--compare baseline.json] [--extra-terms N]
+
+Results saved with --output can be passed to --compare on a later commit to
+see the change in p50/p95 for every case. --extra-terms appends N generated
+words to HOOK_PROHIBITED_TERMS, to check that scanning cost does not grow
+with the configured term list.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import string
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+HOOKS_DIR = os.path.dirname(os.path.abspath(__file__))
+if HOOKS_DIR not in sys.path:
+    sys.path.insert(0, HOOKS_DIR)
+
+import hook_telemetry
+from hook_server import run_guard
+from hook_telemetry import percentile
+
+GUARDS = ('clean_commit_guard', 'github_issue_guard', 'protect_claude_md', 'emoji_remover')
+
+
+def extra_terms(count):
+    """count reproducible random words, long enough not to occur in the corpus by chance."""
+    rng = random.Random(0)
+    return [''.join(rng.choices(string.ascii_lowercase, k=rng.randint(8, 14))) for _ in range(count)]
+
+
+def build_corpus(work_dir):
+    """
+    Create the benchmark payloads, writing any files the PostToolUse guard reads.
+
+    Returns:
+        list of (case_name, guard_names, payload_dict)
+    """
+    small_text = "def main():\n    return 0\n" * 4
+    large_text = "line of generated output that is long enough to matter\n" * 100000  # ~5.5 MB
+    long_message = "Refactor the parser. " * 3000
+
+    small_file = os.path.join(work_dir, 'small.py')
+    large_file = os.path.join(work_dir, 'large.log')
+    with open(small_file, 'w', encoding='utf-8') as f:
+        f.write(small_text)
+    with open(large_file, 'w', encoding='utf-8') as f:
+        f.write(large_text)
+
+    def pre(tool_name, tool_input):
+        return {'hook_event_name': 'PreToolUse', 'cwd': work_dir,
+                'tool_name': tool_name, 'tool_input': tool_input}
+
+    def post(tool_name, tool_input):
+        return {'hook_event_name': 'PostToolUse', 'cwd': work_dir,
+                'tool_name': tool_name, 'tool_input': tool_input}
+
+    bash_guards = ('clean_commit_guard', 'github_issue_guard')
+    return [
+        ('bash_non_commit', bash_guards, pre('Bash', {'command': 'ls -la src/'})),
+        ('bash_commit_clean', bash_guards, pre('Bash', {'command': 'git commit -m "Fix off-by-one in pager"'})),
+        ('bash_commit_blocked', bash_guards, pre('Bash', {
+            'command': 'git commit -m "Fix pager\n\nCo-Authored-By: Claude <noreply@anthropic.com>"'})),
+        ('bash_commit_large', bash_guards, pre('Bash', {'command': f'git commit -m "{long_message}"'})),
+        ('bash_gh_issue', bash_guards, pre('Bash', {
+            'command': 'gh issue create --title "Pager bug" --body "Steps to reproduce..."'})),
+        ('mcp_git_commit', ('clean_commit_guard',), pre('git_commit', {'message': 'Add retry to sync'})),
+        ('mcp_issue_create', ('github_issue_guard',), pre('mcp__github__create_issue', {
+            'title': 'Pager bug', 'body': long_message})),
+        ('write_small', ('protect_claude_md',), pre('Write', {'file_path': small_file, 'content': small_text})),
+        ('write_large', ('protect_claude_md',), pre('Write', {'file_path': large_file, 'content': large_text})),
+        ('write_claude_md', ('protect_claude_md',), pre('Write', {
+            'file_path': os.path.join(work_dir, 'CLAUDE.md'), 'content': small_text})),
+        ('post_edit_small', ('emoji_remover',), post('Edit', {
+            'file_path': small_file, 'old_string': 'return 0', 'new_string': 'return 1'})),
+        ('post_write_large', ('emoji_remover',), post('Write', {'file_path': large_file, 'content': large_text})),
+        ('post_multiedit', ('emoji_remover',), post('MultiEdit', {
+            'file_path': small_file,
+            'edits': [{'old_string': 'main', 'new_string': 'entry'}] * 20})),
+    ]
+
+
+def summarize(samples_ms):
+    """Reduce a list of millisecond timings to summary statistics."""
+    ordered = sorted(samples_ms)
+    return {
+        'runs': len(ordered),
+        'min_ms': round(ordered[0], 3),
+        'p50_ms': round(percentile(ordered, 50), 3),
+        'p95_ms': round(percentile(ordered, 95), 3),
+        'p99_ms': round(percentile(ordered, 99), 3),
+        'max_ms': round(ordered[-1], 3),
+    }
+
+
+# Runs the guard like settings.json does (runpy.run_path as __main__) and, once
+# it exits, writes the child's own peak RSS in KiB to the file named in argv[2].
+# The parent cannot use wait4()/getrusage() for this on Linux: exec folds the
+# pre-exec memory's high-water mark into ru_maxrss, and with vfork that is
+# the benchmark process itself, so the figure grew with the parent's payloads.
+# VmHWM only covers the memory of the exec'd interpreter.
+COLD_WRAPPER = """
+import runpy, sys
+script, rss_path = sys.argv[1:3]
+sys.argv = [script]
+try:
+    runpy.run_path(script, run_name='__main__')
+finally:
+    rss_kb = ''
+    try:
+        with open('/proc/self/status') as status:
+            rss_kb = next(line.split()[1] for line in status if line.startswith('VmHWM:'))
+    except (OSError, StopIteration):
+        try:
+            import resource
+            rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            rss_kb = str(rss // 1024 if sys.platform == 'darwin' else rss)
+        except ImportError:
+            pass
+    with open(rss_path, 'w') as out:
+        out.write(rss_kb)
+"""
+
+
+def bench_cold(guard, payload_bytes, runs):
+    """Time the guard as a fresh interpreter per call; peak RSS as reported by the child."""
+    script = os.path.join(HOOKS_DIR, guard + '.py')
+    env = dict(os.environ, HOOK_TELEMETRY='0')
+    samples = []
+    peak_rss_kb = None
+    exit_code = None
+    fd, rss_path = tempfile.mkstemp(prefix='bench_rss.')
+    os.close(fd)
+    try:
+        for _ in range(runs):
+            start = time.perf_counter()
+            proc = subprocess.Popen([sys.executable, '-c', COLD_WRAPPER, script, rss_path],
+                                    stdin=subprocess.PIPE, env=env,
+                                    stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            proc.stdin.write(payload_bytes)
+            proc.stdin.close()
+            proc.wait()
+            samples.append((time.perf_counter() - start) * 1000)
+            exit_code = proc.returncode
+            with open(rss_path) as f:
+                rss_kb = f.read().strip()
+            if rss_kb:
+                peak_rss_kb = max(peak_rss_kb or 0, int(rss_kb))
+    finally:
+        os.unlink(rss_path)
+    result = summarize(samples)
+    result['peak_rss_kb'] = peak_rss_kb
+    result['exit_code'] = exit_code
+    return result
+
+
+def bench_in_process(guard, payload_bytes, runs):
+    """Time the guard as the hook server runs it; peak allocation from tracemalloc."""
+    # Warm up imports and caches so only steady-state cost is measured
+    exit_code, _, _ = run_guard(guard, payload_bytes)
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        run_guard(guard, payload_bytes)
+        samples.append((time.perf_counter() - start) * 1000)
+
+    # Separate pass: tracemalloc slows allocation, so keep it out of the timings
+    tracemalloc.start()
+    run_guard(guard, payload_bytes)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    result = summarize(samples)
+    result['peak_alloc_kb'] = round(peak / 1024, 1)
+    result['exit_code'] = exit_code
+    return result
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', '-C', HOOKS_DIR, 'rev-parse', '--short', 'HEAD'],
+                              capture_output=True, text=True, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def run_benchmarks(guards, runs, cold_runs):
+    results = []
+    with tempfile.TemporaryDirectory(prefix='hook-bench-') as work_dir:
+        for case, case_guards, payload in build_corpus(work_dir):
+            payload_bytes = json.dumps(payload).encode('utf-8')
+            for guard in case_guards:
+                if guard not in guards:
+                    continue
+                entry = {
+                    'case': case,
+                    'guard': guard,
+                    'payload_bytes': len(payload_bytes),
+                    'in_process': bench_in_process(guard, payload_bytes, runs),
+                    'cold_start': bench_cold(guard, payload_bytes, cold_runs) if cold_runs else None,
+                }
+                results.append(entry)
+                print_row(entry)
+    return results
+
+
+def print_header():
+    print(f"{'case':<22} {'guard':<20} {'bytes':>9} {'cold p50':>9} {'cold p95':>9} "
+          f"{'in p50':>8} {'in p95':>8} {'in p99':>8} {'rss KB':>8} {'alloc KB':>9}")
+
+
+def print_row(entry):
+    cold = entry['cold_start'] or {}
+    warm = entry['in_process']
+
+    def fmt(value, width, digits=2):
+        return f"{value:>{width}.{digits}f}" if value is not None else f"{'-':>{width}}"
+
+    print(f"{entry['case']:<22} {entry['guard']:<20} {entry['payload_bytes']:>9} "
+          f"{fmt(cold.get('p50_ms'), 9)} {fmt(cold.get('p95_ms'), 9)} "
+          f"{fmt(warm['p50_ms'], 8, 3)} {fmt(warm['p95_ms'], 8, 3)} {fmt(warm['p99_ms'], 8, 3)} "
+          f"{cold.get('peak_rss_kb') or '-':>8} {warm['peak_alloc_kb']:>9}")
+
+
+def compare(results, baseline_path):
+    """Print the p50/p95 change of every case against a saved run."""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    previous = {(e['case'], e['guard']): e for e in baseline.get('results', [])}
+
+    print(f"\nCompared with {baseline_path} ({baseline.get('git_revision') or 'unknown revision'}):")
+    print(f"{'case':<22} {'guard':<20} {'in p50':>16} {'in p95':>16} {'cold p50':>18}")
+    for entry in results:
+        old = previous.get((entry['case'], entry['guard']))
+        if not old:
+            continue
+
+        def delta(mode, key):
+            new_value = (entry.get(mode) or {}).get(key)
+            old_value = (old.get(mode) or {}).get(key)
+            if new_value is None or old_value is None:
+                return '-'
+            change = (new_value - old_value) / old_value * 100 if old_value else 0.0
+            return f"{new_value:.3f} ({change:+.0f}%)"
+
+        print(f"{entry['case']:<22} {entry['guard']:<20} {delta('in_process', 'p50_ms'):>16} "
+              f"{delta('in_process', 'p95_ms'):>16} {delta('cold_start', 'p50_ms'):>18}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the guard hooks.")
+    parser.add_argument('--runs', type=int, default=200, help="in-process runs per case (default: 200)")
+    parser.add_argument('--cold-runs', type=int, default=10,
+                        help="fresh-interpreter runs per case, 0 to skip (default: 10)")
+    parser.add_argument('--guard', action='append', choices=GUARDS, help="only benchmark this guard")
+    parser.add_argument('--output', help="write results as JSON to this file")
+    parser.add_argument('--compare', help="JSON from a previous --output run to compare against")
+    parser.add_argument('--extra-terms', type=int, default=0, metavar='N',
+                        help="add N generated prohibited terms, for scan cost with a long term list")
+    args = parser.parse_args()
+
+    if args.extra_terms:
+        # Read by text_policy on first import, which the guards trigger; cold runs inherit it
+        configured = os.environ.get('HOOK_PROHIBITED_TERMS') or 'Claude,Anthropic'
+        os.environ['HOOK_PROHIBITED_TERMS'] = ','.join([configured] + extra_terms(args.extra_terms))
+
+    # Keep benchmark runs out of the real hook telemetry
+    hook_telemetry.ENABLED = False
+    print_header()
+    results = run_benchmarks(set(args.guard or GUARDS), args.runs, args.cold_runs)
+
+    report = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'git_revision': git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'runs': args.runs,
+        'cold_runs': args.cold_runs,
+        'extra_terms': args.extra_terms,
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults saved to: {args.output}")
+    if args.compare:
+        compare(results, args.compare)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
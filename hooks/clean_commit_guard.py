@@ -1,164 +1,149 @@
 #!/usr/bin/env python3
 """
-Hook to prevent commits containing "Claude" or "Anthropic" in any form, and emojis.
+Hook to prevent commits containing the prohibited terms in any form, and emojis.
+The terms default to "Claude" and "Anthropic" (see HOOK_PROHIBITED_TERMS).
 Blocks commits with these terms in:
 - Commit messages
 - Author fields
 - Co-author fields
 - Emojis in commit messages
 """
-import json
+import os
 import sys
-import re
-
-def contains_emoji(text):
-    """Check if text contains any emoji characters."""
-    # Unicode ranges for emoji characters
-    emoji_pattern = re.compile(
-        "["
-        "\U0001F600-\U0001F64F"  # emoticons
-        "\U0001F300-\U0001F5FF"  # symbols & pictographs
-        "\U0001F680-\U0001F6FF"  # transport & map symbols
-        "\U0001F1E0-\U0001F1FF"  # flags (iOS)
-        "\U00002702-\U000027B0"  # dingbats
-        "\U000024C2-\U0001F251"  # enclosed characters
-        "\U0001F900-\U0001F9FF"  # supplemental symbols
-        "\U0001FA70-\U0001FAFF"  # symbols and pictographs extended-a
-        "]+", flags=re.UNICODE)
-    return bool(emoji_pattern.search(text))
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from text_policy import EMOJI_PATTERN, EXTRA_NEWLINES, POLICY_VERSION, compile_policy, scan, terms_label
+from verdict_cache import cached_verdict, source_version
+from hook_telemetry import run_main
+
+# Key for cached verdicts: the policy (text_policy.py included) plus this
+# file's source, so edits to either invalidate them
+CACHE_VERSION = f"{POLICY_VERSION}:{source_version(os.path.abspath(__file__))}"
 
 def check_git_commit_command(command):
     """Check if a git commit command contains prohibited terms."""
-    prohibited_terms = ['claude', 'anthropic']
-    command_lower = command.lower()
-    
+    # One pass over the command finds both emojis and prohibited terms
+    result = scan(command)
+
     # Check for emojis in the command
-    if contains_emoji(command):
+    if result.has_emoji:
         return True, "Command contains emojis - removing emojis from commit"
-    
+
     # Check for prohibited terms in the entire command
-    for term in prohibited_terms:
-        if term in command_lower:
-            return True, f"Command contains '{term}' - removing all Claude/Anthropic references"
-    
-    # Specific checks for git commit patterns
-    if 'git commit' in command:
-        # Check for co-author patterns
-        if re.search(r'co-authored-by:.*claude', command_lower):
-            return True, "Removing Claude as co-author from commit"
-        
-        # Check for author override attempts
-        if '--author' in command and any(term in command_lower for term in prohibited_terms):
-            return True, "Cannot set Claude/Anthropic as commit author"
-            
+    if result.terms:
+        return True, f"Command contains '{result.terms[0]}' - removing all {terms_label()} references"
+
+    # Co-author trailers and --author overrides naming a prohibited term are
+    # covered by the whole-command term check above
+
     return False, None
 
 def suggest_cleaned_command(command):
     """Suggest a cleaned version of the command."""
+    patterns = compile_policy()
+
     # Remove all emojis
-    emoji_pattern = re.compile(
-        "["
-        "\U0001F600-\U0001F64F"  # emoticons
-        "\U0001F300-\U0001F5FF"  # symbols & pictographs
-        "\U0001F680-\U0001F6FF"  # transport & map symbols
-        "\U0001F1E0-\U0001F1FF"  # flags (iOS)
-        "\U00002702-\U000027B0"  # dingbats
-        "\U000024C2-\U0001F251"  # enclosed characters
-        "\U0001F900-\U0001F9FF"  # supplemental symbols
-        "\U0001FA70-\U0001FAFF"  # symbols and pictographs extended-a
-        "]+", flags=re.UNICODE)
-    cleaned = emoji_pattern.sub('', command)
-    
-    # Remove co-author lines with Claude/Anthropic
-    cleaned = re.sub(r'(?i)co-authored-by:.*(?:claude|anthropic).*\n?', '', cleaned)
-    
-    # Remove any lines mentioning generated with Claude
-    cleaned = re.sub(r'(?i).*generated with.*claude.*\n?', '', cleaned)
-    
+    cleaned = EMOJI_PATTERN.sub('', command)
+
+    # Remove co-author lines naming a prohibited term
+    cleaned = patterns['co_author_line'].sub('', cleaned)
+
+    # Remove any "generated with <term>" lines
+    cleaned = patterns['generated_with_line'].sub('', cleaned)
+
     # Clean up author fields
     if '--author' in cleaned:
-        cleaned = re.sub(r'--author[= ]["\']?[^"\']*(?:claude|anthropic)[^"\']*["\']?', '', cleaned, flags=re.IGNORECASE)
-    
+        cleaned = patterns['author'].sub('', cleaned)
+
     # Remove extra whitespace and newlines
-    cleaned = re.sub(r'\n{3,}', '\n\n', cleaned)
+    cleaned = EXTRA_NEWLINES.sub('\n\n', cleaned)
     cleaned = cleaned.strip()
-    
+
     return cleaned
 
-def main():
-    try:
-        input_data = json.load(sys.stdin)
-        tool_name = input_data.get('tool_name', '')
-        tool_input = input_data.get('tool_input', {})
-        cwd = input_data.get('cwd', '')
-
-        # Exception: Skip checks if we're in the ~/.claude/ directory
-        # This is the only directory where "claude" is allowed in paths
-        import os
-        claude_dir = os.path.expanduser('~/.claude').replace('\\', '/')
-        current_dir = cwd.replace('\\', '/')
-        if current_dir.startswith(claude_dir):
-            sys.exit(0)  # Allow all commands in ~/.claude/
-
-        # Handle both Bash commands and MCP git tools
-        if tool_name == 'Bash':
-            command = tool_input.get('command', '')
-        elif tool_name == 'git_commit':
-            # For MCP git_commit tool, check the message parameter
-            message = tool_input.get('message', '')
-            if message:
-                # Check the commit message for prohibited content
-                has_issue, issue_message = check_git_commit_command(f'git commit -m "{message}"')
-                if has_issue:
-                    print(f"BLOCKED: {issue_message}", file=sys.stderr)
-                    print("\nYour CLAUDE.md configuration specifies:", file=sys.stderr)
-                    print("- Never add Claude as a commit author", file=sys.stderr)
-                    print("- Always commit using the default git settings", file=sys.stderr)
-                    sys.exit(2)  # Exit code 2 blocks the command
-            sys.exit(0)
-        else:
-            sys.exit(0)
+def print_policy():
+    print("\nYour CLAUDE.md configuration specifies:", file=sys.stderr)
+    print(f"- Never add {terms_label(' or ')} as a commit author", file=sys.stderr)
+    print("- Always commit using the default git settings", file=sys.stderr)
+
+def check_commit_message(message):
+    """Check an MCP git_commit message; returns the hook exit code."""
+    # Check the commit message for prohibited content
+    has_issue, issue_message = check_git_commit_command(f'git commit -m "{message}"')
+    if has_issue:
+        print(f"BLOCKED: {issue_message}", file=sys.stderr)
+        print_policy()
+        return 2  # Exit code 2 blocks the command
+    return 0
+
+def check_bash_command(command):
+    """Check a git commit/config Bash command; returns the hook exit code."""
+    # Block git config commands that try to set a prohibited term as author
+    if 'git config' in command:
+        has_term = bool(scan(command, emojis=False).terms)
+        if 'user.name' in command and has_term:
+            print(f"BLOCKED: Cannot set git user.name to {terms_label(' or ')}", file=sys.stderr)
+            print("Use the default git settings for commits", file=sys.stderr)
+            return 2  # Exit code 2 blocks the command
+        if 'user.email' in command and has_term:
+            print(f"BLOCKED: Cannot set git user.email with {terms_label()}", file=sys.stderr)
+            print("Use the default git settings for commits", file=sys.stderr)
+            return 2
             
-        command = tool_input.get('command', '')
-        
-        # Check if this is a git commit command
-        if 'git commit' not in command and 'git config' not in command:
-            sys.exit(0)
+    # Check git commit commands
+    has_issue, message = check_git_commit_command(command)
+    
+    if has_issue:
+        print(f"BLOCKED: {message}", file=sys.stderr)
+        print_policy()
         
-        # Block git config commands that try to set Claude as author
-        if 'git config' in command:
-            command_lower = command.lower()
-            if 'user.name' in command and ('claude' in command_lower or 'anthropic' in command_lower):
-                print("BLOCKED: Cannot set git user.name to Claude or Anthropic", file=sys.stderr)
-                print("Use the default git settings for commits", file=sys.stderr)
-                sys.exit(2)  # Exit code 2 blocks the command
-            if 'user.email' in command and ('claude' in command_lower or 'anthropic' in command_lower):
-                print("BLOCKED: Cannot set git user.email with Claude/Anthropic", file=sys.stderr)
-                print("Use the default git settings for commits", file=sys.stderr)
-                sys.exit(2)
-                
-        # Check git commit commands
-        has_issue, message = check_git_commit_command(command)
+        # Suggest cleaned command if it's a commit
+        if 'git commit' in command:
+            cleaned = suggest_cleaned_command(command)
+            if cleaned and 'git commit' in cleaned:
+                print("\nSuggested cleaned command:", file=sys.stderr)
+                print(cleaned, file=sys.stderr)
+                print("\nThe commit will use your default git author settings.", file=sys.stderr)
         
-        if has_issue:
-            print(f"BLOCKED: {message}", file=sys.stderr)
-            print("\nYour CLAUDE.md configuration specifies:", file=sys.stderr)
-            print("- Never add Claude as a commit author", file=sys.stderr)
-            print("- Always commit using the default git settings", file=sys.stderr)
-            
-            # Suggest cleaned command if it's a commit
-            if 'git commit' in command:
-                cleaned = suggest_cleaned_command(command)
-                if cleaned and 'git commit' in cleaned:
-                    print("\nSuggested cleaned command:", file=sys.stderr)
-                    print(cleaned, file=sys.stderr)
-                    print("\nThe commit will use your default git author settings.", file=sys.stderr)
-            
-            sys.exit(2)  # Exit code 2 blocks the command
-            
-    except Exception as e:
-        # Silent fail - don't break Claude's workflow
-        sys.exit(0)
+        return 2  # Exit code 2 blocks the command
+
+    return 0
+
+def run(input_data):
+    """Check a decoded hook payload and return the hook exit code (2 blocks)."""
+    tool_name = input_data.get('tool_name', '')
+    tool_input = input_data.get('tool_input', {})
+    cwd = input_data.get('cwd', '')
+
+    # Exception: Skip checks if we're in the ~/.claude/ directory
+    # This is the only directory where "claude" is allowed in paths
+    claude_dir = os.path.expanduser('~/.claude').replace('\\', '/')
+    current_dir = cwd.replace('\\', '/')
+    if current_dir.startswith(claude_dir):
+        return 0  # Allow all commands in ~/.claude/
+
+    # Handle both Bash commands and MCP git tools
+    if tool_name == 'git_commit':
+        # For MCP git_commit tool, check the message parameter
+        message = tool_input.get('message', '')
+        if not message:
+            return 0
+        return cached_verdict('clean_commit_guard', CACHE_VERSION, tool_name, message,
+                              lambda: check_commit_message(message))
+    if tool_name != 'Bash':
+        return 0
+
+    command = tool_input.get('command', '')
+    
+    # Check if this is a git commit command
+    if 'git commit' not in command and 'git config' not in command:
+        return 0
+
+    return cached_verdict('clean_commit_guard', CACHE_VERSION, tool_name, command,
+                          lambda: check_bash_command(command))
+
+def main():
+    run_main('clean_commit_guard', run)
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
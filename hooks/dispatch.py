@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Single entry point for all guard hooks.
+
+Reads the hook payload once, looks up which guards apply to the event and
+tool_name in GUARD_REGISTRY, runs them in-process and combines the result:
+the call is blocked (exit code 2) if any guard blocks, and the messages of
+every guard are passed through in registry order.
+
+Usage (from settings.json, for both PreToolUse and PostToolUse):
+    dispatch.py [PreToolUse|PostToolUse]
+
+The event defaults to the payload's hook_event_name. To add a guard, give it
+a run(input_data) function returning the hook exit code and list it here.
+
+A guard may also define prefilter(payload_bytes), returning False when it
+can tell from the raw JSON that run() would do nothing. dispatch_raw() reads
+the event and tool_name straight from the bytes and, when every guard for
+them declines, answers without decoding the payload at all, which matters
+for Write calls carrying megabytes of content.
+"""
+import importlib
+import io
+import json
+import os
+import re
+import sys
+from contextlib import redirect_stderr, redirect_stdout
+from functools import lru_cache
+
+HOOKS_DIR = os.path.dirname(os.path.abspath(__file__))
+if HOOKS_DIR not in sys.path:
+    sys.path.insert(0, HOOKS_DIR)
+
+from hook_telemetry import Timer, record
+
+FILE_TOOLS = ('Edit', 'MultiEdit', 'Write', 'NotebookEdit')
+GITHUB_ISSUE_TOOLS = (
+    'mcp__github__create_issue',
+    'mcp__github__add_issue_comment',
+    'mcp__github__update_issue',
+)
+
+# event -> tool_name -> guards to run, in order
+GUARD_REGISTRY = {
+    'PreToolUse': {
+        'Bash': ('clean_commit_guard', 'github_issue_guard'),
+        'git_commit': ('clean_commit_guard',),
+        **{tool: ('protect_claude_md',) for tool in FILE_TOOLS},
+        **{tool: ('github_issue_guard',) for tool in GITHUB_ISSUE_TOOLS},
+    },
+    'PostToolUse': {
+        **{tool: ('emoji_remover',) for tool in FILE_TOOLS},
+    },
+}
+
+# The rest of a '"key": "string"' pair after the key
+_STRING_VALUE = re.compile(rb'\s*:\s*("(?:[^"\\]|\\.)*")', flags=re.DOTALL)
+
+# name -> (module, source mtime)
+_loaded = {}
+
+
+def load_guard(name):
+    """Import a guard once, reloading it if its source changed on disk."""
+    path = os.path.join(HOOKS_DIR, name + '.py')
+    mtime = os.stat(path).st_mtime_ns
+    entry = _loaded.get(name)
+    if entry is None:
+        module = importlib.import_module(name)
+    elif entry[1] != mtime:
+        module = importlib.reload(entry[0])
+    else:
+        return entry[0]
+    _loaded[name] = (module, mtime)
+    return module
+
+
+@lru_cache(maxsize=None)
+def _key_pattern(keys):
+    return re.compile(b'"(' + b'|'.join(re.escape(key.encode('ascii')) for key in keys) + b')"')
+
+
+def raw_string_fields(payload, *keys):
+    """
+    Find the string values stored under the given keys anywhere in raw JSON bytes.
+
+    Inside a JSON string every quote is escaped, so '"key"' followed by a
+    colon only occurs where key is an object key (encoders write keys
+    literally). All keys are found in one pass over the bytes and only the
+    matching values are decoded.
+
+    Returns:
+        dict of key -> list of values, or None if a value cannot be decoded
+    """
+    values = {key: [] for key in keys}
+    pattern = _key_pattern(keys)
+    pos = 0
+    while True:
+        match = pattern.search(payload, pos)
+        if not match:
+            return values
+        pos = match.end()
+        value = _STRING_VALUE.match(payload, pos)
+        if value:
+            try:
+                values[match.group(1).decode('ascii')].append(json.loads(value.group(1)))
+            except ValueError:
+                return None
+            pos = value.end()
+
+
+def needs_run(name, payload):
+    """Return False only if the guard's prefilter() rules the raw payload out."""
+    try:
+        prefilter = getattr(load_guard(name), 'prefilter', None)
+        return prefilter is None or bool(prefilter(payload))
+    except Exception:
+        return True
+
+
+def run_captured(name, input_data, payload_bytes=None):
+    """
+    Run one guard in-process, capturing its output like a separate process.
+
+    Every run is recorded by hook_telemetry, including exceptions.
+
+    Returns:
+        (exit_code, stdout_text, stderr_text)
+    """
+    timer = Timer()
+    error = None
+    out, err = io.StringIO(), io.StringIO()
+    with redirect_stdout(out), redirect_stderr(err):
+        try:
+            exit_code = load_guard(name).run(input_data) or 0
+        except BaseException as e:
+            # Silent fail - a broken guard must not break the workflow
+            exit_code = 0
+            error = e
+    record(name, timer, exit_code, input_data.get('tool_name'), input_data.get('hook_event_name'),
+           payload_bytes, exception=error)
+    return exit_code, out.getvalue(), err.getvalue()
+
+
+def guards_for(event, tool_name):
+    """Return the guard names registered for an event and tool."""
+    return GUARD_REGISTRY.get(event, {}).get(tool_name, ())
+
+
+def dispatch(input_data, event=None, payload_bytes=None):
+    """
+    Run every guard that applies to the payload and combine their verdicts.
+
+    Returns:
+        (exit_code, stdout_text, stderr_text)
+    """
+    event = event or input_data.get('hook_event_name', 'PreToolUse')
+    exit_code = 0
+    outs, errs = [], []
+    for name in guards_for(event, input_data.get('tool_name', '')):
+        code, out, err = run_captured(name, input_data, payload_bytes)
+        if code == 2 or (code and not exit_code):
+            exit_code = code
+        if out:
+            outs.append(out)
+        if err:
+            errs.append(err)
+    return exit_code, '\n'.join(outs), '\n'.join(errs)
+
+
+def dispatch_raw(payload, event=None):
+    """
+    dispatch() for the raw JSON bytes, decoding them only if a guard needs it.
+
+    Raises:
+        ValueError if the payload has to be decoded and is not valid JSON
+    """
+    timer = Timer()
+    fields = raw_string_fields(payload, 'tool_name', 'hook_event_name')
+    # A nested key of the same name makes the raw read ambiguous; decode instead
+    if fields and len(fields['tool_name']) == 1 and len(fields['hook_event_name']) <= 1:
+        events = [event] if event else fields['hook_event_name']
+        guards = guards_for(events[0] if events else 'PreToolUse', fields['tool_name'][0])
+        if not any(needs_run(name, payload) for name in guards):
+            for name in guards:
+                record(name, timer, 0, fields['tool_name'][0], events[0] if events else None,
+                       len(payload), skipped=True)
+            return 0, '', ''
+    try:
+        input_data = json.loads(payload)
+    except ValueError as e:
+        record('dispatch', timer, 0, payload_bytes=len(payload), exception=e)
+        raise
+    return dispatch(input_data, event, len(payload))
+
+
+def main():
+    # argv is ['-c', 'dispatch.py', ...] when launched through runpy
+    args = sys.argv[1:]
+    if args and args[0].endswith('.py'):
+        args = args[1:]
+    event = args[0] if args else None
+
+    try:
+        exit_code, out, err = dispatch_raw(sys.stdin.buffer.read(), event)
+    except Exception:
+        sys.exit(0)
+    if out:
+        sys.stdout.write(out)
+    if err:
+        sys.stderr.write(err)
+    sys.exit(exit_code)
+
+
+if __name__ == '__main__':
+    main()
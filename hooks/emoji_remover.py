@@ -2,12 +2,20 @@
 """
 Emoji checker hook for Claude Code.
 Detects emojis in edited files and asks Claude to remove them.
+
+By default only the text written by the tool call is scanned; set
+EMOJI_SCAN_MODE=full to rescan the whole file after every edit. Full-file
+scans are streamed in chunks and skip binary files and files larger than
+EMOJI_MAX_SCAN_BYTES (default 64 MiB).
 """
-import json
+import codecs
 import sys
 import os
 import re
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from hook_telemetry import run_main
+
 # Emoji pattern to detect any emoji
 EMOJI_PATTERN = re.compile(
     "["
@@ -24,26 +32,134 @@ EMOJI_PATTERN = re.compile(
     flags=re.UNICODE
 )
 
-try:
-    input_data = json.load(sys.stdin)
+# "incremental" scans only the text the tool wrote (new_string, edits[].new_string,
+# content, new_source); "full" rescans the whole file after every edit.
+SCAN_MODE = os.environ.get('EMOJI_SCAN_MODE', 'incremental')
+
+# Full-file scans read CHUNK_SIZE bytes at a time and skip files that are too
+# large to be hand-edited or that contain NUL bytes near the start.
+CHUNK_SIZE = 1 << 20
+BINARY_SNIFF_BYTES = 8192
+MAX_SCAN_BYTES = int(os.environ.get('EMOJI_MAX_SCAN_BYTES', str(64 << 20)))
+
+
+def find_emoji(text):
+    """Return (line, column, emoji) of the first emoji in text, or None."""
+    # No emoji range starts below U+2300, so ASCII text cannot contain one
+    if text.isascii():
+        return None
+    match = EMOJI_PATTERN.search(text)
+    if not match:
+        return None
+    start = match.start()
+    line = text.count('\n', 0, start) + 1
+    column = start - (text.rfind('\n', 0, start) + 1) + 1
+    return line, column, match.group()
+
+
+def edited_texts(tool_name, tool_input):
+    """
+    Return [(label, text)] for the text introduced by the tool call.
+
+    label is None when the text is the whole file (Write), so positions are
+    file positions. Returns None when the payload does not carry the edited
+    text and the file has to be scanned instead.
+    """
+    if tool_name == 'Write' and isinstance(tool_input.get('content'), str):
+        return [(None, tool_input['content'])]
+    if tool_name == 'Edit' and isinstance(tool_input.get('new_string'), str):
+        return [('new_string', tool_input['new_string'])]
+    if tool_name == 'MultiEdit' and isinstance(tool_input.get('edits'), list):
+        return [(f'edits[{i}].new_string', edit.get('new_string') or '')
+                for i, edit in enumerate(tool_input['edits'])]
+    if tool_name == 'NotebookEdit' and isinstance(tool_input.get('new_source'), str):
+        return [('new_source', tool_input['new_source'])]
+    return None
+
+
+def scan_edit(tool_name, tool_input, file_path):
+    """Return a location description for the first emoji in the edited text, None if clean."""
+    texts = edited_texts(tool_name, tool_input)
+    if texts is None:
+        return scan_file(file_path)
+    for label, text in texts:
+        found = find_emoji(text)
+        if found:
+            line, column, emoji = found
+            if label is None:
+                return f"'{emoji}' at line {line}, column {column}"
+            return f"'{emoji}' at line {line}, column {column} of {label}"
+    return None
+
+
+def scan_file(file_path):
+    """
+    Return a location description for the first emoji in the file, None if clean.
+
+    The file is decoded in fixed-size chunks and the scan stops at the first
+    match, so memory stays flat regardless of file size. The incremental
+    decoder carries partial UTF-8 sequences over to the next chunk, so an
+    emoji split across a chunk edge is still found. Files larger than
+    MAX_SCAN_BYTES or that look binary are skipped.
+    """
+    if os.path.getsize(file_path) > MAX_SCAN_BYTES:
+        return None
+
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    line = 1
+    column_offset = 0  # characters already seen on the current line
+    with open(file_path, 'rb') as f:
+        chunk = f.read(CHUNK_SIZE)
+        if b'\0' in chunk[:BINARY_SNIFF_BYTES]:
+            return None
+        while True:
+            text = decoder.decode(chunk, final=not chunk)
+            match = None if text.isascii() else EMOJI_PATTERN.search(text)
+            if match:
+                start = match.start()
+                newlines = text.count('\n', 0, start)
+                if newlines:
+                    column = start - text.rfind('\n', 0, start)
+                else:
+                    column = column_offset + start + 1
+                return f"'{match.group()}' at line {line + newlines}, column {column}"
+            if not chunk:
+                return None
+            newlines = text.count('\n')
+            if newlines:
+                line += newlines
+                column_offset = len(text) - text.rfind('\n') - 1
+            else:
+                column_offset += len(text)
+            chunk = f.read(CHUNK_SIZE)
+
+
+def run(input_data):
+    """Check the edited file from a decoded hook payload and return the exit code."""
+    tool_name = input_data.get('tool_name', '')
     tool_input = input_data.get('tool_input', {})
-    file_path = tool_input.get('file_path', '')
+    file_path = tool_input.get('file_path') or tool_input.get('notebook_path', '')
 
     if not file_path or not os.path.exists(file_path):
-        sys.exit(0)
-
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
+        return 0
 
     # Check for emojis
-    emojis_found = EMOJI_PATTERN.findall(content)
+    if SCAN_MODE == 'full':
+        location = scan_file(file_path)
+    else:
+        location = scan_edit(tool_name, tool_input, file_path)
 
-    if emojis_found:
+    if location:
         # Exit with code 2 to block and provide feedback to Claude
-        print(f"Emojis are not allowed in files. Please remove or replace the emojis in {file_path} with text equivalents like [X], [OK], [WARNING], etc.", file=sys.stderr)
-        sys.exit(2)
+        print(f"Emojis are not allowed in files. Found {location} in {file_path}. Please remove or replace the emojis with text equivalents like [X], [OK], [WARNING], etc.", file=sys.stderr)
+        return 2
+
+    return 0
+
+
+def main():
+    run_main('emoji_remover', run)
 
-    sys.exit(0)
 
-except:
-    sys.exit(0)
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Repo-wide emoji sweep.
+
+Applies the emoji_remover hook's EMOJI_PATTERN to a whole tree instead of
+one edited file, and reports every emoji as path:line:column. With --fix,
+emojis are replaced by the text equivalents the hook asks for ([OK], [X],
+[WARNING], ...) or removed when there is none, and each changed file is
+rewritten atomically.
+
+Files come from `git ls-files` (tracked and untracked, minus ignored) when
+the path is inside a git work tree, and from a directory walk otherwise.
+Binary files, files larger than EMOJI_MAX_SCAN_BYTES and files without a
+possible emoji lead byte are skipped after a cheap check on an mmap of the
+file; only candidates are decoded. Files are scanned in a process pool.
+
+Usage:
+    emoji_sweep.py [PATH]... [--fix] [--exclude GLOB]... [-j N] [--json]
+
+Exit code: 0 if no emojis remain, 1 otherwise.
+"""
+import argparse
+import fnmatch
+import json
+import mmap
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+
+HOOKS_DIR = os.path.dirname(os.path.abspath(__file__))
+if HOOKS_DIR not in sys.path:
+    sys.path.insert(0, HOOKS_DIR)
+
+from emoji_remover import BINARY_SNIFF_BYTES, EMOJI_PATTERN, MAX_SCAN_BYTES
+
+# Every EMOJI_PATTERN range is at or above U+2300, so in UTF-8 every match
+# starts with 0xE2 (U+2000-U+2FFF) or 0xF0 0x9F (U+1F000-U+1FFFF)
+LEAD_BYTES = (b'\xe2', b'\xf0\x9f')
+
+# Directories never worth scanning when walking a tree outside git
+SKIP_DIRS = {'.git', '.hg', '.svn', 'node_modules', '__pycache__', '.venv', 'venv', '.tox', '.mypy_cache'}
+
+# Text equivalents used by --fix; emojis not listed here are removed
+EMOJI_TEXT = {
+    **dict.fromkeys('\u2705\u2714\u2713\u2611\U0001F197\U0001F44D\U0001F7E2', '[OK]'),
+    **dict.fromkeys('\u274C\u274E\u2716\u2717\u2718\U0001F6AB\U0001F534\u26D4', '[X]'),
+    **dict.fromkeys('\u26A0\U0001F6A8\U0001F7E1', '[WARNING]'),
+    **dict.fromkeys('\u2757\u2755', '[!]'),
+    **dict.fromkeys('\u2753\u2754', '[?]'),
+    **dict.fromkeys('\U0001F4DD\U0001F4CC', '[NOTE]'),
+    '\U0001F4A1': '[TIP]',
+    '\U0001F41B': '[BUG]',
+    **dict.fromkeys('\U0001F527\U0001F6E0', '[FIX]'),
+    '\U0001F512': '[LOCKED]',
+    **dict.fromkeys('\u2728\U0001F31F', '[*]'),
+    '\u27A1': '->',
+}
+
+# What --fix replaces: runs of pattern characters together with the
+# variation selectors and zero-width joiners that glue multi-part emojis
+# (the detection pattern stops at those, which would leave them behind)
+FIX_PATTERN = re.compile(
+    '(?:' + EMOJI_PATTERN.pattern[:-1] + '[\ufe0e\ufe0f\u200d]*)+ ?',
+    flags=re.UNICODE
+)
+JOINERS = {'\ufe0e', '\ufe0f', '\u200d'}
+
+
+def list_files(path, exclude=()):
+    """Files to sweep under path, relative paths first filtered by the exclude globs."""
+    if os.path.isfile(path):
+        return [path]
+    try:
+        output = subprocess.run(
+            ['git', '-C', path, 'ls-files', '-z', '--cached', '--others', '--exclude-standard'],
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, check=True
+        ).stdout
+        relative = [name for name in output.decode('utf-8', 'surrogateescape').split('\0') if name]
+    except (OSError, subprocess.CalledProcessError):
+        relative = []
+        for dirpath, dirnames, filenames in os.walk(path):
+            dirnames[:] = [name for name in dirnames if name not in SKIP_DIRS]
+            base = os.path.relpath(dirpath, path)
+            relative.extend(os.path.normpath(os.path.join(base, name)).replace(os.sep, '/') for name in filenames)
+
+    files = []
+    for name in dict.fromkeys(relative):  # --cached lists unmerged files once per stage
+        if any(fnmatch.fnmatch(name, pattern) for pattern in exclude):
+            continue
+        full = name if path in ('', '.') else os.path.join(path, name)
+        # ls-files also lists deleted-but-tracked files and submodule directories
+        if os.path.isfile(full) and not os.path.islink(full):
+            files.append(full)
+    return files
+
+
+def read_candidate(file_path):
+    """
+    Return the file's bytes if it may contain an emoji, else None.
+
+    The file is mapped rather than read, so skipping binary files and files
+    without any emoji lead byte costs a couple of C-level scans and no copy.
+    """
+    with open(file_path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0 or size > MAX_SCAN_BYTES:
+            return None
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if mm.find(b'\0', 0, BINARY_SNIFF_BYTES) != -1:
+                return None
+            if all(mm.find(lead) == -1 for lead in LEAD_BYTES):
+                return None
+            return mm[:]
+
+
+def find_all(text):
+    """Yield (line, column, emoji) for every EMOJI_PATTERN match, 1-based like the hook."""
+    line = 1
+    line_start = 0
+    position = 0
+    for match in EMOJI_PATTERN.finditer(text):
+        start = match.start()
+        newlines = text.count('\n', position, start)
+        if newlines:
+            line += newlines
+            line_start = text.rfind('\n', position, start) + 1
+        position = start
+        yield line, start - line_start + 1, match.group()
+
+
+def replace_emoji(match):
+    run = match.group()
+    trailing_space = run.endswith(' ')
+    text = ' '.join(EMOJI_TEXT[char] for char in run.rstrip(' ') if char not in JOINERS and char in EMOJI_TEXT)
+    if not text:
+        # "- <rocket> Deploy" -> "- Deploy", not "-  Deploy"
+        previous = match.string[match.start() - 1] if match.start() else '\n'
+        return '' if previous.isspace() else (' ' if trailing_space else '')
+    return text + (' ' if trailing_space else '')
+
+
+def fix_text(text):
+    return FIX_PATTERN.sub(replace_emoji, text)
+
+
+def write_atomic(file_path, data):
+    """Replace file_path with data via a temporary file in the same directory."""
+    directory = os.path.dirname(os.path.abspath(file_path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f'.{os.path.basename(file_path)}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        shutil.copymode(file_path, tmp_path)
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def sweep_file(file_path, fix=False):
+    """
+    Scan (and with fix=True, rewrite) one file.
+
+    Returns (file_path, violations, fixed, error) where violations lists
+    (line, column, emoji) as found before any fix.
+    """
+    try:
+        data = read_candidate(file_path)
+        if data is None:
+            return file_path, [], False, None
+        # surrogateescape keeps invalid UTF-8 byte-for-byte through a fix
+        text = data.decode('utf-8', 'surrogateescape')
+        violations = list(find_all(text))
+        if not (fix and violations):
+            return file_path, violations, False, None
+        write_atomic(file_path, fix_text(text).encode('utf-8', 'surrogateescape'))
+        return file_path, violations, True, None
+    except OSError as e:
+        return file_path, [], False, str(e)
+
+
+def _sweep_fixing(file_path):
+    return sweep_file(file_path, fix=True)
+
+
+def sweep(paths, fix=False, exclude=(), jobs=None):
+    """Sweep every file under paths; returns sweep_file results in file order."""
+    files = [file for path in paths for file in list_files(path, exclude)]
+    worker = _sweep_fixing if fix else sweep_file
+    if len(files) > 64 and jobs != 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            return list(pool.map(worker, files, chunksize=32))
+    return [worker(file) for file in files]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find (and fix) emojis across a tree.")
+    parser.add_argument('paths', nargs='*', default=['.'], help="files or folders to sweep (default: .)")
+    parser.add_argument('--fix', action='store_true', help="replace emojis with text equivalents in place")
+    parser.add_argument('--exclude', action='append', default=[], metavar='GLOB',
+                        help="skip paths (relative to the swept folder) matching this glob")
+    parser.add_argument('-j', '--jobs', type=int, default=None,
+                        help="worker processes (default: CPU count; 1 scans in this process)")
+    parser.add_argument('--json', action='store_true', help="print the violations as JSON")
+    args = parser.parse_args()
+    # Consoles that cannot show an emoji get its escape instead of a crash
+    sys.stdout.reconfigure(errors='backslashreplace')
+
+    results = sweep(args.paths, args.fix, args.exclude, args.jobs)
+    flagged = [(path, violations, fixed) for path, violations, fixed, error in results if violations]
+    errors = [(path, error) for path, _, _, error in results if error]
+
+    if args.json:
+        print(json.dumps([
+            {'path': path, 'line': line, 'column': column, 'emoji': emoji, 'fixed': fixed}
+            for path, violations, fixed in flagged for line, column, emoji in violations
+        ], ensure_ascii=False, indent=2))
+    else:
+        for path, violations, fixed in flagged:
+            for line, column, emoji in violations:
+                print(f"{path}:{line}:{column}: '{emoji}'{' (fixed)' if fixed else ''}")
+    for path, error in errors:
+        print(f"{path}: {error}", file=sys.stderr)
+
+    count = sum(len(violations) for _, violations, _ in flagged)
+    remaining = sum(len(violations) for _, violations, fixed in flagged if not fixed)
+    action = "Fixed" if args.fix else "Found"
+    print(f"{action} {count} emoji(s) in {len(flagged)} of {len(results)} file(s)", file=sys.stderr)
+    return 1 if remaining or errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
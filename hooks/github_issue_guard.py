@@ -3,7 +3,8 @@
 GitHub Issue Content Guard Hook
 
 WHAT THIS SCRIPT DOES:
-- Prevents GitHub issues created through Claude Code from containing "Claude" or "Anthropic" references
+- Prevents GitHub issues created through Claude Code from containing the prohibited terms
+  ("Claude" and "Anthropic" unless HOOK_PROHIBITED_TERMS says otherwise)
 - Blocks both MCP GitHub tools (mcp__github__create_issue, etc.) and gh CLI commands
 - Allows emojis in GitHub issues (unlike the commit guard hook)
 - Provides helpful error messages and suggests cleaned commands when blocking
@@ -11,7 +12,7 @@ WHAT THIS SCRIPT DOES:
 SPECIFIC BEHAVIORS:
 1. For MCP GitHub tools: Scans title, body, comment, and content fields for prohibited terms
 2. For gh CLI commands: Scans the entire command line for prohibited terms  
-3. Case-insensitive matching for "claude" and "anthropic"
+3. Case-insensitive matching for the prohibited terms
 4. Suggests cleaned versions of gh commands when possible
 5. Exits with code 2 to block the operation when prohibited content is found
 
@@ -21,40 +22,45 @@ TRIGGERED BY:
 
 This prevents issues like "Generated with Claude Code" from appearing in GitHub issues.
 """
-import json
+import os
 import sys
-import re
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from text_policy import POLICY_VERSION, WHITESPACE_RUN, compile_policy, scan, terms_label
+from verdict_cache import cached_verdict, source_version
+from hook_telemetry import run_main
+
+# Key for cached verdicts: the policy (text_policy.py included) plus this
+# file's source, so edits to either invalidate them
+CACHE_VERSION = f"{POLICY_VERSION}:{source_version(os.path.abspath(__file__))}"
+
+GITHUB_TOOLS = [
+    'mcp__github__create_issue',
+    'mcp__github__add_issue_comment', 
+    'mcp__github__update_issue'
+]
+GH_COMMANDS = ['gh issue create', 'gh issue edit', 'gh issue comment']
+FIELDS_TO_CHECK = ['title', 'body', 'comment', 'content']
 
 def check_github_issue_content(text):
     """Check if text contains prohibited terms for GitHub issues."""
     if not text:
         return False, None
-        
-    prohibited_terms = ['claude', 'anthropic']
-    text_lower = text.lower()
-    
-    # Check for prohibited terms
-    for term in prohibited_terms:
-        if term in text_lower:
-            return True, f"Content contains '{term}' - removing all Claude/Anthropic references"
-    
+
+    # Check for prohibited terms (emojis are allowed in issues)
+    terms = scan(text, emojis=False).terms
+    if terms:
+        return True, f"Content contains '{terms[0]}' - removing all {terms_label()} references"
+
     return False, None
 
 def check_mcp_github_tool(tool_name, tool_input):
     """Check MCP GitHub tools for prohibited content."""
-    github_tools = [
-        'mcp__github__create_issue',
-        'mcp__github__add_issue_comment', 
-        'mcp__github__update_issue'
-    ]
-    
-    if tool_name not in github_tools:
+    if tool_name not in GITHUB_TOOLS:
         return False, None
     
     # Check various content fields
-    fields_to_check = ['title', 'body', 'comment', 'content']
-    
-    for field in fields_to_check:
+    for field in FIELDS_TO_CHECK:
         if field in tool_input:
             has_issue, message = check_github_issue_content(tool_input[field])
             if has_issue:
@@ -64,69 +70,84 @@ def check_mcp_github_tool(tool_name, tool_input):
 
 def check_gh_command(command):
     """Check gh CLI commands for prohibited content."""
-    if not any(gh_cmd in command for gh_cmd in ['gh issue create', 'gh issue edit', 'gh issue comment']):
+    if not any(gh_cmd in command for gh_cmd in GH_COMMANDS):
         return False, None
-    
-    command_lower = command.lower()
-    prohibited_terms = ['claude', 'anthropic']
-    
+
     # Check for prohibited terms in the entire command
-    for term in prohibited_terms:
-        if term in command_lower:
-            return True, f"GitHub issue command contains '{term}' - removing all Claude/Anthropic references"
-    
+    terms = scan(command, emojis=False).terms
+    if terms:
+        return True, f"GitHub issue command contains '{terms[0]}' - removing all {terms_label()} references"
+
     return False, None
 
 def suggest_cleaned_gh_command(command):
     """Suggest a cleaned version of the gh command."""
-    # Remove any references to Claude or Anthropic
-    cleaned = re.sub(r'(?i)\b(?:claude|anthropic)\b[^\s]*\s*', '', command)
-    
-    # Remove lines mentioning "Generated with Claude"
-    cleaned = re.sub(r'(?i).*generated with.*claude.*', '', cleaned)
-    
-    # Remove "Co-Authored-By" lines with Claude/Anthropic
-    cleaned = re.sub(r'(?i)co-authored-by:.*(?:claude|anthropic).*', '', cleaned)
-    
+    patterns = compile_policy()
+
+    # Remove any references to the prohibited terms
+    cleaned = patterns['bare_term'].sub('', command)
+
+    # Remove "Generated with <term>" lines
+    cleaned = patterns['generated_with_line'].sub('', cleaned)
+
+    # Remove "Co-Authored-By" lines naming a prohibited term
+    cleaned = patterns['co_author_line'].sub('', cleaned)
+
     # Clean up extra whitespace
-    cleaned = re.sub(r'\s+', ' ', cleaned)
+    cleaned = WHITESPACE_RUN.sub(' ', cleaned)
     cleaned = cleaned.strip()
-    
+
     return cleaned
 
+def check_mcp_call(tool_name, tool_input):
+    """Check an MCP GitHub tool call; returns the hook exit code."""
+    has_issue, message = check_mcp_github_tool(tool_name, tool_input)
+    if has_issue:
+        print(f"BLOCKED: {message}", file=sys.stderr)
+        print(f"GitHub issues cannot contain {terms_label(' or ')} references", file=sys.stderr)
+        return 2  # Exit code 2 blocks the command
+    return 0
+
+def check_bash_command(command):
+    """Check a gh issue command; returns the hook exit code."""
+    has_issue, message = check_gh_command(command)
+    if has_issue:
+        print(f"BLOCKED: {message}", file=sys.stderr)
+        print(f"GitHub issues cannot contain {terms_label(' or ')} references", file=sys.stderr)
+
+        # Suggest cleaned command
+        cleaned = suggest_cleaned_gh_command(command)
+        if cleaned and cleaned != command:
+            print("\nSuggested cleaned command:", file=sys.stderr)
+            print(cleaned, file=sys.stderr)
+
+        return 2  # Exit code 2 blocks the command
+    return 0
+
+def run(input_data):
+    """Check a decoded hook payload and return the hook exit code (2 blocks)."""
+    tool_name = input_data.get('tool_name', '')
+    tool_input = input_data.get('tool_input', {})
+
+    # Check MCP GitHub tools
+    if tool_name in GITHUB_TOOLS:
+        # Only the checked fields go into the cache key
+        fields = {field: tool_input[field] for field in FIELDS_TO_CHECK if field in tool_input}
+        return cached_verdict('github_issue_guard', CACHE_VERSION, tool_name, fields,
+                              lambda: check_mcp_call(tool_name, tool_input))
+
+    # Check Bash commands (for gh CLI)
+    if tool_name == 'Bash':
+        command = tool_input.get('command', '')
+        if not any(gh_cmd in command for gh_cmd in GH_COMMANDS):
+            return 0
+        return cached_verdict('github_issue_guard', CACHE_VERSION, tool_name, command,
+                              lambda: check_bash_command(command))
+
+    return 0
+
 def main():
-    try:
-        input_data = json.load(sys.stdin)
-        tool_name = input_data.get('tool_name', '')
-        tool_input = input_data.get('tool_input', {})
-        
-        # Check MCP GitHub tools
-        if tool_name.startswith('mcp__github__'):
-            has_issue, message = check_mcp_github_tool(tool_name, tool_input)
-            if has_issue:
-                print(f"BLOCKED: {message}", file=sys.stderr)
-                print("GitHub issues cannot contain Claude or Anthropic references", file=sys.stderr)
-                sys.exit(2)  # Exit code 2 blocks the command
-        
-        # Check Bash commands (for gh CLI)
-        elif tool_name == 'Bash':
-            command = tool_input.get('command', '')
-            has_issue, message = check_gh_command(command)
-            if has_issue:
-                print(f"BLOCKED: {message}", file=sys.stderr)
-                print("GitHub issues cannot contain Claude or Anthropic references", file=sys.stderr)
-                
-                # Suggest cleaned command
-                cleaned = suggest_cleaned_gh_command(command)
-                if cleaned and cleaned != command:
-                    print("\nSuggested cleaned command:", file=sys.stderr)
-                    print(cleaned, file=sys.stderr)
-                
-                sys.exit(2)  # Exit code 2 blocks the command
-            
-    except Exception as e:
-        # Silent fail - don't break Claude's workflow
-        sys.exit(0)
+    run_main('github_issue_guard', run)
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
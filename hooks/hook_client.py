@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Thin client for the persistent hook server.
+
+Forwards the hook payload from stdin to hook_server.py over a Unix socket and
+replays the guard's stdout, stderr and exit code, so settings.json can call:
+
+    hook_client.py <guard-name>
+
+instead of paying a full interpreter start plus guard import on every tool
+call. The server is started on first use. If it cannot be reached (or the
+platform has no AF_UNIX support, as on Windows) the guard is run in this
+process instead, which behaves exactly like invoking the guard script
+directly.
+
+When a spawned server does not come up, the client records the failure in
+a marker file (hooks/.hook_server.failed) and for HOOK_SERVER_BACKOFF
+seconds (default 300) runs guards in-process straight away instead of
+spawning and waiting again on every call.
+
+The server runs one guard at a time, so a guard that hangs would stall
+every caller behind it. A request that gets no reply within
+HOOK_SERVER_TIMEOUT seconds (default 5) is abandoned and the guard is run
+in-process, without spawning another server.
+
+Each request carries the client's HOOK_* and EMOJI_* environment, so the
+server applies the settings of the session that calls it rather than those
+of the session that happened to start it.
+"""
+import json
+import os
+import sys
+import socket
+import time
+
+HOOKS_DIR = os.path.dirname(os.path.abspath(__file__))
+SOCKET_PATH = os.environ.get('HOOK_SERVER_SOCKET') or os.path.join(HOOKS_DIR, '.hook_server.sock')
+CONNECT_TIMEOUT = 0.05
+READ_TIMEOUT = float(os.environ.get('HOOK_SERVER_TIMEOUT') or 5)
+STARTUP_WAIT = 2.0
+FAILED_MARKER = os.path.join(HOOKS_DIR, '.hook_server.failed')
+SPAWN_BACKOFF = float(os.environ.get('HOOK_SERVER_BACKOFF') or 300)
+
+# request() result for a server that is running but did not answer in time
+TIMED_OUT = 'timed out'
+
+
+def hook_env(environ=os.environ):
+    """The environment settings the guards read, sent along with each request."""
+    return {
+        key: value for key, value in environ.items()
+        if key.startswith(('HOOK_', 'EMOJI_')) and not key.startswith('HOOK_SERVER_')
+    }
+
+
+def request(guard, payload):
+    """
+    Send one payload to the server.
+
+    Returns (code, stdout, stderr), None if no server could be reached, or
+    TIMED_OUT if one is listening but busy or slower than READ_TIMEOUT.
+    """
+    if not hasattr(socket, 'AF_UNIX'):
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+            conn.settimeout(CONNECT_TIMEOUT)
+            conn.connect(SOCKET_PATH)
+            deadline = time.monotonic() + READ_TIMEOUT
+            conn.settimeout(READ_TIMEOUT)
+            header = f"{guard} {json.dumps(hook_env(), separators=(',', ':'))}\n"
+            conn.sendall(header.encode('utf-8') + payload)
+            conn.shutdown(socket.SHUT_WR)
+            chunks = []
+            while True:
+                # One deadline for the whole reply, not per recv
+                conn.settimeout(max(deadline - time.monotonic(), 0.001))
+                chunk = conn.recv(65536)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+    except socket.timeout:
+        return TIMED_OUT
+    except OSError:
+        return None
+
+    response = b''.join(chunks)
+    header, sep, body = response.partition(b'\n')
+    if not sep:
+        return None
+    try:
+        code, out_len, err_len = (int(field) for field in header.split())
+    except ValueError:
+        return None
+    return code, body[:out_len], body[out_len:out_len + err_len]
+
+
+def start_server():
+    """Launch hook_server.py detached from this process and return its Popen."""
+    import subprocess
+    kwargs = {}
+    if os.name == 'posix':
+        kwargs['start_new_session'] = True
+    return subprocess.Popen(
+        [sys.executable, os.path.join(HOOKS_DIR, 'hook_server.py')],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        close_fds=True,
+        **kwargs
+    )
+
+
+def spawn_backed_off():
+    """True while a recent failed spawn says not to try again yet."""
+    try:
+        return time.time() - os.stat(FAILED_MARKER).st_mtime < SPAWN_BACKOFF
+    except OSError:
+        return False
+
+
+def mark_spawn(failed):
+    try:
+        if failed:
+            with open(FAILED_MARKER, 'w', encoding='utf-8') as f:
+                f.write(f"{time.time():.0f} {SOCKET_PATH}\n")
+        else:
+            os.unlink(FAILED_MARKER)
+    except OSError:
+        pass
+
+
+def start_and_request(guard, payload):
+    """Start the server and retry the request until it answers, it dies or STARTUP_WAIT passes."""
+    try:
+        server = start_server()
+    except OSError:
+        mark_spawn(failed=True)
+        return None
+    deadline = time.monotonic() + STARTUP_WAIT
+    delay = 0.01
+    result = None
+    while result is None and time.monotonic() < deadline:
+        time.sleep(delay)
+        delay = min(delay * 2, 0.2)
+        result = request(guard, payload)
+        if result is TIMED_OUT:
+            # Some server is up and holding the socket; it is just not answering
+            break
+        if result is None and server.poll() is not None:
+            # Exited without serving: a server already running elsewhere
+            # would have answered, so give this attempt one last try
+            result = request(guard, payload)
+            break
+    mark_spawn(failed=result is None)
+    return result
+
+
+def run_in_process(guard, payload):
+    """Fallback: load the guard here and run it like the standalone script."""
+    sys.path.insert(0, HOOKS_DIR)
+    import hook_server
+    return hook_server.run_guard(guard, payload)
+
+
+def main():
+    # Works both as `hook_client.py <guard>` and through the runpy one-liner
+    # in settings.json, where argv is ['-c', 'hook_client.py', '<guard>'].
+    args = sys.argv[1:]
+    if args and args[0].endswith('.py'):
+        args = args[1:]
+    if not args:
+        sys.exit(0)
+    guard = args[0]
+    payload = sys.stdin.buffer.read()
+
+    result = request(guard, payload)
+    if result is None and hasattr(socket, 'AF_UNIX') and not spawn_backed_off():
+        result = start_and_request(guard, payload)
+    if result is None or result is TIMED_OUT:
+        result = run_in_process(guard, payload)
+
+    code, out, err = result
+    if out:
+        sys.stdout.buffer.write(out)
+        sys.stdout.flush()
+    if err:
+        sys.stderr.buffer.write(err)
+        sys.stderr.flush()
+    sys.exit(code)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Persistent hook server.
+
+Loads the guard hooks once and serves them over a Unix socket so each tool
+call costs a socket round trip instead of a fresh interpreter plus imports.
+Started on demand by hook_client.py and exits on its own after being idle.
+
+Protocol (one request per connection):
+- client sends "<guard-name>\\n" followed by the raw hook JSON, then closes
+  its write side
+- server replies "<exit-code> <stdout-bytes> <stderr-bytes>\\n" followed by
+  the captured stdout and stderr
+
+The header may carry the client's HOOK_*/EMOJI_* environment as JSON after
+the guard name ("<guard-name> {...}\\n").
+
+The guard name "dispatch" runs every guard registered in dispatch.py for
+the payload's event and tool. A guard is reloaded when its source file
+changes. When one of the shared modules (SHARED_MODULES) changes, or a
+request arrives with a different environment, every hook module is dropped
+and imported afresh with that environment, because they read their
+settings (HOOK_PROHIBITED_TERMS, EMOJI_SCAN_MODE, HOOK_TELEMETRY*, ...) at
+import time. Edits and settings therefore take effect on the next call
+without restarting the server.
+"""
+import importlib
+import json
+import os
+import socket
+import sys
+
+HOOKS_DIR = os.path.dirname(os.path.abspath(__file__))
+if HOOKS_DIR not in sys.path:
+    sys.path.insert(0, HOOKS_DIR)
+
+import dispatch
+import hook_telemetry
+from hook_client import SOCKET_PATH, hook_env
+
+GUARDS = ('clean_commit_guard', 'github_issue_guard', 'protect_claude_md', 'emoji_remover')
+# Imported by the guards; a change to any of them means a fresh import of everything
+SHARED_MODULES = ('hook_telemetry', 'text_policy', 'verdict_cache', 'dispatch')
+IDLE_TIMEOUT = int(os.environ.get('HOOK_SERVER_IDLE_TIMEOUT', '1800'))
+
+# (shared module mtimes, environment) the loaded modules were imported with
+_state = None
+
+
+def _shared_mtimes():
+    mtimes = []
+    for name in SHARED_MODULES:
+        try:
+            mtimes.append(os.stat(os.path.join(HOOKS_DIR, name + '.py')).st_mtime_ns)
+        except OSError:
+            mtimes.append(None)
+    return tuple(mtimes)
+
+
+def refresh(env=None):
+    """
+    Make sure the hook modules match their sources and the given environment.
+
+    env is the caller's hook_env(); None keeps this process's environment.
+    """
+    global _state, dispatch, hook_telemetry
+    current_env = hook_env()
+    if env is None:
+        env = current_env
+    state = (_shared_mtimes(), tuple(sorted(env.items())))
+    if _state is None:
+        _state = state
+    if state == _state:
+        return
+    for key in current_env:
+        if key not in env:
+            del os.environ[key]
+    os.environ.update(env)
+    for name in SHARED_MODULES + GUARDS:
+        sys.modules.pop(name, None)
+    hook_telemetry = importlib.import_module('hook_telemetry')
+    dispatch = importlib.import_module('dispatch')
+    _state = state
+
+
+def run_guard(name, payload, env=None):
+    """
+    Run one guard against a raw JSON payload, mirroring the standalone script.
+
+    Returns:
+        (exit_code, stdout_bytes, stderr_bytes)
+    """
+    if name != 'dispatch' and name not in GUARDS:
+        return 0, b'', b''
+    try:
+        refresh(env)
+    except Exception:
+        return 0, b'', b''
+    timer = hook_telemetry.Timer()
+    try:
+        if name == 'dispatch':
+            exit_code, out, err = dispatch.dispatch_raw(payload)
+        elif not dispatch.needs_run(name, payload):
+            hook_telemetry.record(name, timer, 0, payload_bytes=len(payload), skipped=True)
+            return 0, b'', b''
+        else:
+            try:
+                input_data = json.loads(payload)
+            except ValueError as e:
+                hook_telemetry.record(name, timer, 0, payload_bytes=len(payload), exception=e)
+                raise
+            exit_code, out, err = dispatch.run_captured(name, input_data, len(payload))
+    except Exception:
+        # Silent fail - same as the scripts when they cannot start
+        return 0, b'', b''
+    return exit_code, out.encode('utf-8'), err.encode('utf-8')
+
+
+def handle(conn):
+    """Serve a single client connection."""
+    chunks = []
+    while True:
+        chunk = conn.recv(65536)
+        if not chunk:
+            break
+        chunks.append(chunk)
+    header, _, payload = b''.join(chunks).partition(b'\n')
+    name, _, env = header.decode('utf-8', 'replace').strip().partition(' ')
+    try:
+        env = json.loads(env) if env else None
+    except ValueError:
+        env = None
+    if not isinstance(env, dict):
+        env = None
+    code, out, err = run_guard(name, payload, env)
+    conn.sendall(f"{code} {len(out)} {len(err)}\n".encode('ascii') + out + err)
+
+
+def socket_is_stale():
+    """
+    Return True only if nothing listens on the socket path any more.
+
+    A refused connection (or a missing file) proves the socket is dead. A
+    timeout or EAGAIN means a live server with a full backlog, whose socket
+    must not be unlinked.
+    """
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            probe.settimeout(0.05)
+            probe.connect(SOCKET_PATH)
+        return False
+    except (ConnectionRefusedError, FileNotFoundError):
+        return True
+    except OSError:
+        return False
+
+
+def bind_socket():
+    """
+    Bind the server socket, replacing a stale one; None if a live server owns it.
+
+    The probe, unlink and bind run under an exclusive lock so two servers
+    starting at once cannot both decide the socket is stale.
+    """
+    try:
+        import fcntl
+    except ImportError:
+        fcntl = None
+    with open(SOCKET_PATH + '.lock', 'w') as lock:
+        if fcntl is not None:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        if os.path.exists(SOCKET_PATH):
+            if not socket_is_stale():
+                return None
+            os.unlink(SOCKET_PATH)
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        old_umask = os.umask(0o177)
+        try:
+            server.bind(SOCKET_PATH)
+        except OSError:
+            server.close()
+            return None
+        finally:
+            os.umask(old_umask)
+        server.listen(16)
+        return server
+
+
+def serve():
+    server = bind_socket()
+    if server is None:
+        return 0
+    # Identifies our socket file, so exiting never removes a successor's
+    socket_inode = os.stat(SOCKET_PATH).st_ino
+
+    for name in GUARDS:
+        try:
+            dispatch.load_guard(name)
+        except Exception:
+            pass
+
+    server.settimeout(IDLE_TIMEOUT)
+
+    try:
+        while True:
+            try:
+                conn, _ = server.accept()
+            except socket.timeout:
+                break
+            with conn:
+                conn.settimeout(10)
+                try:
+                    handle(conn)
+                except OSError:
+                    pass
+    finally:
+        server.close()
+        try:
+            if os.stat(SOCKET_PATH).st_ino == socket_inode:
+                os.unlink(SOCKET_PATH)
+        except OSError:
+            pass
+    return 0
+
+
+if __name__ == '__main__':
+    if not hasattr(socket, 'AF_UNIX'):
+        print("hook_server: AF_UNIX sockets are not available on this platform", file=sys.stderr)
+        sys.exit(1)
+    sys.exit(serve())
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Per-invocation telemetry for the guard hooks.
+
+With telemetry enabled, every guard run (through dispatch.py, the hook
+server or a standalone script) appends one JSON line: guard, event, tool_name, payload size,
+decision (allow, block, skip when a prefilter waved the payload through,
+error when an exception made the guard fail open), exit code, wall and CPU
+time and the exception, if any. The log rotates by size, and writing it
+never affects the hook result.
+
+Recording is off by default, since it adds a stat and an appended write to
+every hook call. Configured through the environment:
+- HOOK_TELEMETRY=1 enables recording
+- HOOK_TELEMETRY_PATH: log file (default hooks/.telemetry.jsonl)
+- HOOK_TELEMETRY_MAX_BYTES: rotate above this size (default 5 MiB),
+  keeping HOOK_TELEMETRY_BACKUPS old files (default 3)
+
+Usage:
+    hook_telemetry.py report [--by-tool] [--since HOURS] [--path FILE]
+"""
+import json
+import os
+import sys
+import time
+
+HOOKS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+ENABLED = os.environ.get('HOOK_TELEMETRY', '').strip().lower() in ('1', 'true', 'yes', 'on')
+LOG_PATH = os.environ.get('HOOK_TELEMETRY_PATH') or os.path.join(HOOKS_DIR, '.telemetry.jsonl')
+MAX_BYTES = int(os.environ.get('HOOK_TELEMETRY_MAX_BYTES') or 5 << 20)
+BACKUPS = int(os.environ.get('HOOK_TELEMETRY_BACKUPS') or 3)
+# A rotation lock older than this was left by a crashed process
+STALE_LOCK_SECONDS = 30
+
+
+class Timer:
+    """Wall and CPU time since creation, in milliseconds."""
+
+    def __init__(self):
+        self.wall = time.perf_counter()
+        self.cpu = time.process_time()
+
+    def elapsed(self):
+        return ((time.perf_counter() - self.wall) * 1000, (time.process_time() - self.cpu) * 1000)
+
+
+def decision_for(exit_code, exception=None, skipped=False):
+    if exception is not None:
+        return 'error'
+    if skipped:
+        return 'skip'
+    return {0: 'allow', 2: 'block'}.get(exit_code, f'exit {exit_code}')
+
+
+def rotate_if_full(path):
+    """
+    Rotate path once it reaches MAX_BYTES, safely against concurrent hooks.
+
+    Only the process that creates the lock file rotates; the others skip
+    rotation and keep appending. The size is checked again under the lock,
+    so a log another process has just rotated is not rotated a second time.
+    """
+    if os.stat(path).st_size < MAX_BYTES:
+        return
+    lock_path = path + '.lock'
+    try:
+        fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+    except FileExistsError:
+        try:
+            if time.time() - os.stat(lock_path).st_mtime > STALE_LOCK_SECONDS:
+                os.unlink(lock_path)
+        except OSError:
+            pass
+        return
+    try:
+        if os.stat(path).st_size >= MAX_BYTES:
+            rotate(path)
+    finally:
+        os.close(fd)
+        try:
+            os.unlink(lock_path)
+        except OSError:
+            pass
+
+
+def rotate(path):
+    """Shift path -> path.1 -> ... -> path.BACKUPS, dropping the oldest."""
+    for index in range(BACKUPS - 1, 0, -1):
+        older = f"{path}.{index}"
+        if os.path.exists(older):
+            os.replace(older, f"{path}.{index + 1}")
+    if BACKUPS > 0:
+        os.replace(path, f"{path}.1")
+    else:
+        os.unlink(path)
+
+
+def record(guard, timer, exit_code=0, tool_name=None, event=None, payload_bytes=None,
+           exception=None, skipped=False):
+    """Append one invocation record; failures are ignored."""
+    if not ENABLED:
+        return
+    wall_ms, cpu_ms = timer.elapsed()
+    entry = {
+        'ts': round(time.time(), 3),
+        'guard': guard,
+        'event': event,
+        'tool': tool_name,
+        'payload_bytes': payload_bytes,
+        'decision': decision_for(exit_code, exception, skipped),
+        'exit_code': exit_code,
+        'wall_ms': round(wall_ms, 3),
+        'cpu_ms': round(cpu_ms, 3),
+        'exception': f"{type(exception).__name__}: {exception}" if exception is not None else None,
+    }
+    try:
+        try:
+            rotate_if_full(LOG_PATH)
+        except FileNotFoundError:
+            pass
+        # One short write to an O_APPEND file, so concurrent hooks do not interleave
+        with open(LOG_PATH, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+    except Exception:
+        pass
+
+
+def run_main(guard, run, prefilter=None):
+    """
+    Standalone entry point shared by the guard scripts.
+
+    Reads the payload from stdin, runs the guard, records the invocation and
+    exits with the guard's code. Any exception fails open (exit 0), as the
+    scripts always have, but is now recorded instead of silently dropped.
+    """
+    timer = Timer()
+    payload = b''
+    input_data = {}
+    exit_code = 0
+    try:
+        payload = sys.stdin.buffer.read()
+        if prefilter is not None and not prefilter(payload):
+            record(guard, timer, 0, payload_bytes=len(payload), skipped=True)
+            sys.exit(0)
+        input_data = json.loads(payload)
+        exit_code = run(input_data) or 0
+    except Exception as e:
+        if not isinstance(input_data, dict):
+            input_data = {}
+        record(guard, timer, 0, payload_bytes=len(payload), exception=e,
+               tool_name=input_data.get('tool_name'), event=input_data.get('hook_event_name'))
+        sys.exit(0)
+    record(guard, timer, exit_code, input_data.get('tool_name'), input_data.get('hook_event_name'), len(payload))
+    sys.exit(exit_code)
+
+
+def percentile(sorted_values, pct):
+    """Linear-interpolated percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    k = (len(sorted_values) - 1) * pct / 100.0
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+def read_records(path=LOG_PATH, since=None):
+    """Yield records from the log and its rotated backups, oldest file first."""
+    paths = [f"{path}.{index}" for index in range(BACKUPS, 0, -1)] + [path]
+    for file_path in paths:
+        try:
+            f = open(file_path, 'r', encoding='utf-8')
+        except OSError:
+            continue
+        with f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # A torn line from a crash or a concurrent rotation
+                if since is None or entry.get('ts', 0) >= since:
+                    yield entry
+
+
+def aggregate(records, by_tool=False):
+    """Group records by guard (and tool) into latency and decision statistics."""
+    groups = {}
+    for entry in records:
+        key = (entry.get('guard'), entry.get('tool') if by_tool else None)
+        groups.setdefault(key, []).append(entry)
+
+    rows = []
+    for (guard, tool), entries in sorted(groups.items(), key=lambda item: tuple(map(str, item[0]))):
+        walls = sorted(entry['wall_ms'] for entry in entries)
+        decisions = {}
+        for entry in entries:
+            decisions[entry['decision']] = decisions.get(entry['decision'], 0) + 1
+        count = len(entries)
+        rows.append({
+            'guard': guard,
+            'tool': tool,
+            'calls': count,
+            'p50_ms': percentile(walls, 50),
+            'p95_ms': percentile(walls, 95),
+            'p99_ms': percentile(walls, 99),
+            'max_ms': walls[-1],
+            'cpu_ms_avg': sum(entry['cpu_ms'] for entry in entries) / count,
+            'block_rate': decisions.get('block', 0) / count,
+            'skips': decisions.get('skip', 0),
+            'errors': decisions.get('error', 0),
+            'last_error': next((entry['exception'] for entry in reversed(entries) if entry.get('exception')), None),
+        })
+    return rows
+
+
+def print_report(rows):
+    print(f"{'guard':<20} {'tool':<26} {'calls':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+          f"{'max ms':>8} {'cpu ms':>7} {'block':>6} {'skip':>6} {'errors':>6}")
+    for row in rows:
+        print(f"{row['guard'] or '-':<20} {(row['tool'] or '-')[:26]:<26} {row['calls']:>7} "
+              f"{row['p50_ms']:>8.3f} {row['p95_ms']:>8.3f} {row['p99_ms']:>8.3f} {row['max_ms']:>8.3f} "
+              f"{row['cpu_ms_avg']:>7.3f} {row['block_rate']:>6.1%} {row['skips']:>6} {row['errors']:>6}")
+    failing = [row for row in rows if row['errors']]
+    if failing:
+        print()
+    for row in failing:
+        print(f"{row['guard']} failed open {row['errors']} time(s); last: {row['last_error']}")
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Summarize the hook telemetry log.")
+    commands = parser.add_subparsers(dest='command', required=True)
+    report_parser = commands.add_parser('report', help="latency percentiles and block rates per guard")
+    report_parser.add_argument('--path', default=LOG_PATH, help=f"log file (default: {LOG_PATH})")
+    report_parser.add_argument('--since', type=float, help="only the last HOURS hours")
+    report_parser.add_argument('--by-tool', action='store_true', help="split each guard by tool_name")
+    report_parser.add_argument('--json', action='store_true', help="print the rows as JSON")
+    args = parser.parse_args()
+
+    since = time.time() - args.since * 3600 if args.since else None
+    rows = aggregate(read_records(args.path, since), args.by_tool)
+    if not rows:
+        print(f"No hook telemetry in {args.path}")
+        return 1
+    if args.json:
+        print(json.dumps(rows, indent=2))
+    else:
+        print_report(rows)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
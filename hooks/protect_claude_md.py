@@ -2,42 +2,143 @@
 """
 Hook to prevent any modifications to files named CLAUDE.md
 Protects both user-level and project-level CLAUDE.md files from being edited.
+
+Further paths can be protected with HOOK_PROTECTED_PATHS, a comma-separated
+list of globs, e.g. "*.lock,package-lock.json,src/generated/**,AGENTS.md".
+A glob without a slash matches the file name anywhere; a glob with a slash
+matches the end of the path (or the whole path if it starts with / or ~).
+"*" stays within one path component and "**" spans any number of them.
+Matching is case-insensitive. All globs are compiled into a single regex,
+so the cost per call does not grow with the number of rules.
+
+prefilter() works on the raw payload bytes: it pulls out only the
+file_path/notebook_path strings, so Write payloads with megabytes of content
+are allowed without being JSON-decoded unless one of their paths matches.
 """
-import json
 import sys
 import os
+import re
+from functools import lru_cache
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from dispatch import FILE_TOOLS, raw_string_fields
+from hook_telemetry import run_main
+
+DEFAULT_PROTECTED_PATHS = ('CLAUDE.md',)
+
+PROTECTED_PATHS = DEFAULT_PROTECTED_PATHS + tuple(
+    pattern.strip()
+    for pattern in os.environ.get('HOOK_PROTECTED_PATHS', '').split(',')
+    if pattern.strip() and pattern.strip() not in DEFAULT_PROTECTED_PATHS
+)
+
+PATH_KEYS = ('file_path', 'notebook_path')
+
+
+def glob_to_regex(pattern):
+    """Translate one protected-path glob into a regex matching normalized paths."""
+    pattern = os.path.expanduser(pattern).replace('\\', '/')
+    if pattern.startswith('/'):
+        prefix, pattern = '^/', pattern.lstrip('/')
+    else:
+        # Relative globs match at any directory boundary
+        prefix = '(?:^|/)'
+    out = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith('**/', i):
+            out.append('(?:.*/)?')
+            i += 3
+        elif pattern.startswith('**', i):
+            out.append('.*')
+            i += 2
+        elif pattern[i] == '*':
+            out.append('[^/]*')
+            i += 1
+        elif pattern[i] == '?':
+            out.append('[^/]')
+            i += 1
+        elif pattern[i] == '[' and ']' in pattern[i + 2:]:
+            end = pattern.index(']', i + 2)
+            body = pattern[i + 1:end]
+            negate = body.startswith('!')
+            body = re.escape(body[1:] if negate else body).replace('\\-', '-')
+            out.append(f"[{'^' if negate else ''}{body}]")
+            i = end + 1
+        else:
+            out.append(re.escape(pattern[i]))
+            i += 1
+    return prefix + ''.join(out) + '$'
+
+
+@lru_cache(maxsize=None)
+def compile_matcher(patterns=PROTECTED_PATHS):
+    """Compile every glob into one regex; group rN is the Nth pattern."""
+    return re.compile(
+        '|'.join(f'(?P<r{i}>{glob_to_regex(pattern)})' for i, pattern in enumerate(patterns)),
+        flags=re.IGNORECASE
+    )
+
+
+def protected_rule(file_path, patterns=PROTECTED_PATHS):
+    """Return the glob protecting file_path, or None."""
+    if not file_path:
+        return None
+    match = compile_matcher(patterns).search(file_path.replace('\\', '/'))
+    return patterns[int(match.lastgroup[1:])] if match else None
+
+
+def prefilter(payload):
+    """
+    Decide from the raw JSON bytes whether run() could block this payload.
+
+    Returns False only when every file_path/notebook_path string in the
+    payload is unprotected; the full payload then never needs decoding.
+    """
+    fields = raw_string_fields(payload, *PATH_KEYS)
+    if fields is None:
+        return True
+    return any(protected_rule(path) for paths in fields.values() for path in paths)
+
+
+def run(input_data):
+    """Check a decoded hook payload and return the hook exit code (2 blocks)."""
+    tool_name = input_data.get('tool_name', '')
+
+    # Check only file modification tools
+    if tool_name not in FILE_TOOLS:
+        return 0
+
+    tool_input = input_data.get('tool_input', {})
+    file_path = tool_input.get('file_path') or tool_input.get('notebook_path') or ''
+
+    rule = protected_rule(file_path)
+    if rule is None:
+        return 0
+
+    # Check if the file being modified is named CLAUDE.md
+    if rule == 'CLAUDE.md':
+        print("❌ BLOCKED: Cannot modify CLAUDE.md files")
+        print("\nCLAUDE.md files contain user instructions that should only be modified by the user directly.")
+        print("These files are protected from automated modifications.")
+
+        # Provide context about which CLAUDE.md was attempted
+        if '.claude' in file_path:
+            if os.path.expanduser('~') in file_path:
+                print("\nAttempted to modify: User-level CLAUDE.md (~/.claude/CLAUDE.md)")
+            else:
+                print("\nAttempted to modify: Project-level CLAUDE.md (.claude/CLAUDE.md)")
+
+        print("\nIf you need to update your instructions, please edit CLAUDE.md manually.")
+    else:
+        print(f"❌ BLOCKED: Cannot modify {file_path}")
+        print(f"\nThe path matches the protected pattern '{rule}' (HOOK_PROTECTED_PATHS).")
+        print("These files are protected from automated modifications.")
+
+    return 2  # Exit code 2 blocks the command
 
 def main():
-    try:
-        input_data = json.load(sys.stdin)
-        tool_name = input_data.get('tool_name', '')
-        
-        # Check only file modification tools
-        if tool_name not in ['Edit', 'MultiEdit', 'Write', 'NotebookEdit']:
-            sys.exit(0)
-            
-        file_path = input_data.get('tool_input', {}).get('file_path', '')
-        
-        # Check if the file being modified is named CLAUDE.md
-        if os.path.basename(file_path).upper() == 'CLAUDE.MD':
-            print("❌ BLOCKED: Cannot modify CLAUDE.md files")
-            print("\nCLAUDE.md files contain user instructions that should only be modified by the user directly.")
-            print("These files are protected from automated modifications.")
-            
-            # Provide context about which CLAUDE.md was attempted
-            if '.claude' in file_path:
-                if os.path.expanduser('~') in file_path:
-                    print("\nAttempted to modify: User-level CLAUDE.md (~/.claude/CLAUDE.md)")
-                else:
-                    print("\nAttempted to modify: Project-level CLAUDE.md (.claude/CLAUDE.md)")
-            
-            print("\nIf you need to update your instructions, please edit CLAUDE.md manually.")
-            
-            sys.exit(2)  # Exit code 2 blocks the command
-            
-    except Exception as e:
-        # Silent fail - don't break Claude's workflow
-        sys.exit(0)
+    run_main('protect_claude_md', run, prefilter)
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Shared text policy for the guard hooks.
+
+Holds the prohibited-term list, the emoji ranges blocked in commits and the
+compiled patterns built from them, so clean_commit_guard.py and
+github_issue_guard.py compile nothing per call and share one definition.
+
+scan() checks a string for every prohibited term and for emojis in one
+pass over the lowercased input. The terms are compiled into a single regex
+shaped like a trie of the term list, so the cost per character depends on
+the longest term rather than on how many terms HOOK_PROHIBITED_TERMS lists
+(bench_hooks.py --extra-terms measures this). The emoji ranges are a branch
+of the same pattern, left out for ASCII-only input (the usual case for
+commands), which cannot contain an emoji.
+
+The term list defaults to "claude,anthropic" and can be overridden with a
+comma-separated HOOK_PROHIBITED_TERMS environment variable.
+"""
+import hashlib
+import os
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+DEFAULT_PROHIBITED_TERMS = ('Claude', 'Anthropic')
+
+# The terms as configured, for messages; matching uses PROHIBITED_TERMS
+TERM_NAMES = tuple(
+    term.strip()
+    for term in os.environ.get('HOOK_PROHIBITED_TERMS', ','.join(DEFAULT_PROHIBITED_TERMS)).split(',')
+    if term.strip()
+) or DEFAULT_PROHIBITED_TERMS
+
+PROHIBITED_TERMS = tuple(term.lower() for term in TERM_NAMES)
+
+# Unicode ranges for emoji characters blocked in commit messages
+EMOJI_CLASS = (
+    "["
+    "\U0001F600-\U0001F64F"  # emoticons
+    "\U0001F300-\U0001F5FF"  # symbols & pictographs
+    "\U0001F680-\U0001F6FF"  # transport & map symbols
+    "\U0001F1E0-\U0001F1FF"  # flags (iOS)
+    "\U00002702-\U000027B0"  # dingbats
+    "\U000024C2-\U0001F251"  # enclosed characters
+    "\U0001F900-\U0001F9FF"  # supplemental symbols
+    "\U0001FA70-\U0001FAFF"  # symbols and pictographs extended-a
+    "]"
+)
+
+EMOJI_PATTERN = re.compile(EMOJI_CLASS + "+", flags=re.UNICODE)
+
+# Changes whenever the terms, the emoji ranges or any code in this file (the
+# cleaning patterns, scan(), ...) do; part of cached verdict keys
+with open(os.path.abspath(__file__), 'rb') as _source:
+    POLICY_VERSION = hashlib.sha256(
+        repr((PROHIBITED_TERMS, EMOJI_CLASS)).encode('utf-8') + _source.read()
+    ).hexdigest()[:16]
+EXTRA_NEWLINES = re.compile(r'\n{3,}')
+WHITESPACE_RUN = re.compile(r'\s+')
+
+ScanResult = namedtuple('ScanResult', ['has_emoji', 'terms'])
+
+
+def terms_label(separator='/'):
+    """The configured terms for a message, e.g. "Claude/Anthropic"."""
+    return separator.join(TERM_NAMES)
+
+
+def _trie(terms):
+    trie = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[''] = term
+    return trie
+
+
+def _trie_pattern(node):
+    # Longer continuations are tried before stopping, so a match is the
+    # longest term starting at its position
+    branches = [re.escape(char) + _trie_pattern(child) for char, child in sorted(node.items()) if char]
+    if not branches:
+        return ''
+    body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+    return f'(?:{body})?' if '' in node else body
+
+
+def _prefix_terms(trie, terms):
+    # A match only reports the longest term at a position; these are the
+    # shorter terms that also start there
+    prefixes = {}
+    for term in terms:
+        node, found = trie, []
+        for char in term:
+            node = node[char]
+            if '' in node:
+                found.append(node[''])
+        prefixes[term] = tuple(found)
+    return prefixes
+
+
+@lru_cache(maxsize=None)
+def compile_policy(terms=PROHIBITED_TERMS):
+    """
+    Compile every pattern derived from a term list, once per list.
+
+    Returns a dict with:
+        co_author_line, generated_with_line, author, bare_term: cleaning patterns
+        term_scanner, scanner: scan() matchers for the terms, and the terms plus emojis
+        prefix_terms: term -> every term that is a prefix of it (itself included)
+        emoji_terms: terms that contain an emoji themselves
+    """
+    trie = _trie(terms)
+    # Trie-shaped, so the cleaning patterns do not slow down with the term
+    # list either; never matches when there are no terms
+    alternation = _trie_pattern(trie) or '(?!)'
+    term_group = f"({alternation})"
+    return {
+        'term_scanner': re.compile(term_group),
+        'scanner': re.compile(f"{term_group}|{EMOJI_CLASS}"),
+        'prefix_terms': _prefix_terms(trie, terms),
+        'emoji_terms': frozenset(term for term in terms if EMOJI_PATTERN.search(term)),
+        'co_author_line': re.compile(rf"co-authored-by:.*(?:{alternation}).*\n?", flags=re.IGNORECASE),
+        # Anchored to line starts: an unanchored leading .* retries from every
+        # offset and goes quadratic on a long single-line message
+        'generated_with_line': re.compile(rf"^.*generated with.*(?:{alternation}).*\n?",
+                                          flags=re.IGNORECASE | re.MULTILINE),
+        'author': re.compile(
+            rf"--author[= ][\"']?[^\"']*(?:{alternation})[^\"']*[\"']?",
+            flags=re.IGNORECASE
+        ),
+        'bare_term': re.compile(rf"\b(?:{alternation})\b[^\s]*\s*", flags=re.IGNORECASE),
+    }
+
+
+def scan(text, terms=PROHIBITED_TERMS, emojis=True):
+    """
+    Check text for prohibited terms and (optionally) emojis.
+
+    Returns:
+        ScanResult(has_emoji, terms) where terms lists the prohibited terms
+        found, in the configured order.
+    """
+    if not text:
+        return ScanResult(False, ())
+    policy = compile_policy(terms)
+    # No emoji range starts below U+2300, so ASCII text cannot contain one
+    pattern = policy['scanner'] if emojis and not text.isascii() else policy['term_scanner']
+    text_lower = text.lower()
+    found = set()
+    has_emoji = False
+    match = pattern.search(text_lower)
+    while match:
+        term = match.group(1)
+        if term is None:
+            has_emoji = True
+            # One emoji is enough; only terms are left to find
+            pattern = policy['term_scanner']
+        else:
+            found.update(policy['prefix_terms'][term])
+            has_emoji = has_emoji or (emojis and term in policy['emoji_terms'])
+        # Resume one character on, so terms overlapping this match are found too
+        match = pattern.search(text_lower, match.start() + 1)
+    return ScanResult(has_emoji, tuple(term for term in terms if term in found))
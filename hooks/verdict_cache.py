@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Opt-in verdict cache for the guard hooks.
+
+Agents re-issue the same commands many times per session. With the cache
+enabled, a guard's verdict (exit code plus the messages it printed) is stored
+under a hash of the guard name, its config version, the tool name and the
+tool_input fields the verdict depends on, so a repeated call is a hash lookup
+and a replay of the stored output.
+
+Configured through the environment:
+- HOOK_VERDICT_CACHE: unset/empty disables the cache, "memory" keeps an LRU
+  in the process (useful with the long-lived hook_server.py), "disk" also
+  persists it to a small SQLite file for one-process-per-call setups
+- HOOK_VERDICT_CACHE_SIZE: maximum number of verdicts kept (default 512)
+- HOOK_VERDICT_CACHE_PATH: SQLite file for "disk" mode
+  (default hooks/.verdict_cache.sqlite)
+
+A guard's config version must change whenever anything other than the keyed
+fields could change its verdict (prohibited terms, guard source, ...);
+source_version() hashes source files for that. This module's own source is
+part of every key, so changing how verdicts are stored or replayed drops
+the old ones.
+"""
+import hashlib
+import io
+import json
+import os
+import sys
+import time
+from collections import OrderedDict
+from contextlib import redirect_stderr, redirect_stdout
+
+HOOKS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+MODE = os.environ.get('HOOK_VERDICT_CACHE', '').strip().lower()
+MAX_ENTRIES = max(1, int(os.environ.get('HOOK_VERDICT_CACHE_SIZE') or 512))
+DISK_PATH = os.environ.get('HOOK_VERDICT_CACHE_PATH') or os.path.join(HOOKS_DIR, '.verdict_cache.sqlite')
+
+# key -> (exit_code, stdout_text, stderr_text), least recently used first
+_memory = OrderedDict()
+_connection = None
+
+
+def source_version(*paths):
+    """Short hash of the given source files' contents."""
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+SOURCE_VERSION = source_version(os.path.abspath(__file__))
+
+
+def cache_key(guard, version, tool_name, fields):
+    """Hash everything a verdict depends on into a fixed-size key."""
+    digest = hashlib.sha256(f"{SOURCE_VERSION}\0{guard}\0{version}\0{tool_name}\0".encode('utf-8'))
+    if not isinstance(fields, str):
+        fields = json.dumps(fields, sort_keys=True, ensure_ascii=False)
+    digest.update(fields.encode('utf-8', 'surrogatepass'))
+    return digest.hexdigest()
+
+
+def _disk():
+    """Open (once) the on-disk cache, or return None if it cannot be used."""
+    global _connection
+    if _connection is None:
+        import sqlite3
+        try:
+            _connection = sqlite3.connect(DISK_PATH, timeout=0.2, isolation_level=None)
+            _connection.execute(
+                "CREATE TABLE IF NOT EXISTS verdicts ("
+                "key TEXT PRIMARY KEY, code INTEGER, out TEXT, err TEXT, used REAL)"
+            )
+        except sqlite3.Error:
+            _connection = False
+    return _connection or None
+
+
+def _lookup(key):
+    verdict = _memory.get(key)
+    if verdict is not None:
+        _memory.move_to_end(key)
+        return verdict
+    if MODE != 'disk' or _disk() is None:
+        return None
+    try:
+        row = _disk().execute("SELECT code, out, err FROM verdicts WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        _disk().execute("UPDATE verdicts SET used = ? WHERE key = ?", (time.time(), key))
+    except Exception:
+        return None
+    _remember(key, tuple(row))
+    return tuple(row)
+
+
+def _remember(key, verdict):
+    _memory[key] = verdict
+    _memory.move_to_end(key)
+    while len(_memory) > MAX_ENTRIES:
+        _memory.popitem(last=False)
+
+
+def _store(key, verdict):
+    _remember(key, verdict)
+    if MODE != 'disk' or _disk() is None:
+        return
+    try:
+        conn = _disk()
+        conn.execute("INSERT OR REPLACE INTO verdicts (key, code, out, err, used) VALUES (?, ?, ?, ?, ?)",
+                     (key, *verdict, time.time()))
+        if conn.execute("SELECT count(*) FROM verdicts").fetchone()[0] > MAX_ENTRIES:
+            conn.execute("DELETE FROM verdicts WHERE key IN "
+                         "(SELECT key FROM verdicts ORDER BY used DESC LIMIT -1 OFFSET ?)", (MAX_ENTRIES,))
+    except Exception:
+        pass  # The cache is only an optimisation
+
+
+def cached_verdict(guard, version, tool_name, fields, compute):
+    """
+    Return compute()'s exit code, reusing a stored verdict when one exists.
+
+    compute() prints its messages as usual; they are captured, stored with
+    the exit code and written out again on every hit, so callers cannot
+    tell a cached verdict from a fresh one. With the cache disabled this is
+    just compute().
+    """
+    if MODE not in ('memory', 'disk'):
+        return compute()
+
+    key = cache_key(guard, version, tool_name, fields)
+    verdict = _lookup(key)
+    if verdict is None:
+        out, err = io.StringIO(), io.StringIO()
+        with redirect_stdout(out), redirect_stderr(err):
+            code = compute()
+        verdict = (code or 0, out.getvalue(), err.getvalue())
+        _store(key, verdict)
+
+    code, out, err = verdict
+    if out:
+        sys.stdout.write(out)
+    if err:
+        sys.stderr.write(err)
+    return code
@@ -3,17 +3,38 @@
 Skill Initializer - Creates a new skill from template
 
 Usage:
-    init_skill.py <skill-name> --path <path>
+    init_skill.py <skill-name> --path <path> [--from <existing-skill> [--link]]
 
 Examples:
     init_skill.py my-new-skill --path skills/public
     init_skill.py my-api-helper --path skills/private
     init_skill.py custom-skill --path /custom/location
+    init_skill.py pdf-forms --path skills/public --from skills/public/pdf
+
+--from clones an existing skill instead of using the template. Files are
+reflinked (copy-on-write) where the filesystem supports it and otherwise
+copied with the kernel's fast copy path; only the frontmatter name and the
+title of SKILL.md are rewritten. --link hardlinks files instead of copying
+when reflinks are unavailable, which is fastest but means editing a file in
+place changes it in both skills.
 """
 
+import os
+import re
 import sys
+import errno
+import shutil
+import argparse
 from pathlib import Path
 
+from package_skill import EXCLUDED_NAMES, EXCLUDED_SUFFIXES
+
+# ioctl that shares a file's extents with another (Linux btrfs, XFS, bcachefs, ...)
+FICLONE = 0x40049409
+# errno values meaning "this filesystem or pair of files cannot be cloned"
+CLONE_UNSUPPORTED = {errno.EXDEV, errno.EINVAL, errno.ENOTTY, errno.EPERM, errno.EBADF,
+                     getattr(errno, 'EOPNOTSUPP', errno.EINVAL), getattr(errno, 'ENOTSUP', errno.EINVAL)}
+
 
 SKILL_TEMPLATE = """---
 name: {skill_name}
@@ -270,28 +291,197 @@ def init_skill(skill_name, path):
     return skill_dir
 
 
+def reflink(source, destination):
+    """
+    Create destination as a copy-on-write clone of source.
+
+    Returns:
+        True if cloned, False if the platform or filesystem cannot clone
+    """
+    if sys.platform.startswith('linux'):
+        import fcntl
+        with open(source, 'rb') as src, open(destination, 'wb') as dst:
+            try:
+                fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+                return True
+            except OSError as e:
+                if e.errno not in CLONE_UNSUPPORTED:
+                    raise
+        os.unlink(destination)
+        return False
+    if sys.platform == 'darwin':
+        import ctypes
+        libc = ctypes.CDLL(None, use_errno=True)
+        if not hasattr(libc, 'clonefile'):
+            return False
+        if libc.clonefile(os.fsencode(source), os.fsencode(destination), 0) == 0:
+            return True
+        if ctypes.get_errno() not in CLONE_UNSUPPORTED:
+            raise OSError(ctypes.get_errno(), os.strerror(ctypes.get_errno()), str(destination))
+        return False
+    return False
+
+
+def clone_file(source, destination, link=False):
+    """
+    Copy one file by the cheapest available means.
+
+    Tries a reflink, then (with link=True) a hardlink, then a streamed copy,
+    which shutil does with copy_file_range/sendfile or fcopyfile where
+    available. Permission bits are kept.
+
+    Returns:
+        'reflinked', 'hardlinked' or 'copied'
+    """
+    if reflink(source, destination):
+        shutil.copymode(source, destination)
+        return 'reflinked'
+    if link:
+        try:
+            os.link(source, destination)
+            return 'hardlinked'
+        except OSError as e:
+            if e.errno not in CLONE_UNSUPPORTED and e.errno != errno.EMLINK:
+                raise
+    shutil.copyfile(source, destination)
+    shutil.copymode(source, destination)
+    return 'copied'
+
+
+def rename_skill_md(text, skill_name, skill_title):
+    """
+    Rewrite the frontmatter name and the first top-level heading of a SKILL.md.
+
+    Every other byte, including line endings, is left as it was.
+    """
+    match = re.match(r'(---\r?\n)(.*?\r?\n)(---)', text, re.DOTALL)
+    if not match:
+        return text
+    frontmatter = match.group(2)
+    # Function replacements, so backslashes in the name or title are kept literally
+    frontmatter, count = re.subn(r'(?m)^(name:[ \t]*).*?(\r?)$', lambda m: m.group(1) + skill_name + m.group(2),
+                                 frontmatter, count=1)
+    if not count:
+        frontmatter = f"name: {skill_name}\n" + frontmatter
+    body = re.sub(r'(?m)^# .*?(\r?)$', lambda m: f"# {skill_title}{m.group(1)}", text[match.end(3):], count=1)
+    return match.group(1) + frontmatter + match.group(3) + body
+
+
+def clone_skill(skill_name, path, source, link=False):
+    """
+    Initialize a new skill directory as a clone of an existing skill.
+
+    Args:
+        skill_name: Name of the new skill
+        path: Path where the skill directory should be created
+        source: Existing skill directory to clone
+        link: Hardlink files when they cannot be reflinked
+
+    Returns:
+        Path to created skill directory, or None if error
+    """
+    source = Path(source).resolve()
+    skill_dir = Path(path).resolve() / skill_name
+
+    if not (source / 'SKILL.md').is_file():
+        print(f"❌ Error: SKILL.md not found in {source}")
+        return None
+    if skill_dir.exists():
+        print(f"❌ Error: Skill directory already exists: {skill_dir}")
+        return None
+    if skill_dir == source or source in skill_dir.parents:
+        print("❌ Error: Cannot clone a skill into itself")
+        return None
+
+    counts = {'reflinked': 0, 'hardlinked': 0, 'copied': 0}
+    total_bytes = 0
+    try:
+        skill_dir.mkdir(parents=True, exist_ok=False)
+        print(f"✅ Created skill directory: {skill_dir}")
+        for dirpath, dirnames, filenames in os.walk(source):
+            relative = Path(dirpath).relative_to(source)
+            target_dir = skill_dir / relative
+            target_dir.mkdir(exist_ok=True)
+            subdirs = []
+            for name in sorted(dirnames):
+                if name in EXCLUDED_NAMES:
+                    continue
+                if (Path(dirpath) / name).is_symlink():
+                    # os.walk lists directory symlinks without entering them; keep them as links
+                    os.symlink(os.readlink(Path(dirpath) / name), target_dir / name, target_is_directory=True)
+                    continue
+                subdirs.append(name)
+            dirnames[:] = subdirs
+            for name in sorted(filenames):
+                if name in EXCLUDED_NAMES or Path(name).suffix in EXCLUDED_SUFFIXES:
+                    continue
+                if relative == Path('.') and name == 'SKILL.md':
+                    continue
+                file_path = Path(dirpath) / name
+                if file_path.is_symlink():
+                    os.symlink(os.readlink(file_path), target_dir / name)
+                    continue
+                counts[clone_file(file_path, target_dir / name, link)] += 1
+                total_bytes += file_path.stat().st_size
+
+        skill_title = title_case_skill_name(skill_name)
+        with open(source / 'SKILL.md', 'r', encoding='utf-8', newline='') as f:
+            skill_content = rename_skill_md(f.read(), skill_name, skill_title)
+        with open(skill_dir / 'SKILL.md', 'w', encoding='utf-8', newline='') as f:
+            f.write(skill_content)
+        print(f"✅ Created SKILL.md (name: {skill_name}, title: {skill_title})")
+    except Exception as e:
+        print(f"❌ Error cloning {source}: {e}")
+        shutil.rmtree(skill_dir, ignore_errors=True)
+        return None
+
+    summary = ', '.join(f"{count} {how}" for how, count in counts.items() if count) or "no other files"
+    print(f"✅ Cloned {summary} ({total_bytes:,} bytes) from {source}")
+    print(f"\n✅ Skill '{skill_name}' initialized successfully at {skill_dir}")
+    print("\nNext steps:")
+    print("1. Update the description and instructions in SKILL.md")
+    print("2. Remove or adapt the cloned files in scripts/, references/, and assets/")
+    print("3. Run the validator when ready to check the skill structure")
+
+    return skill_dir
+
+
 def main():
-    if len(sys.argv) < 4 or sys.argv[2] != '--path':
-        print("Usage: init_skill.py <skill-name> --path <path>")
-        print("\nSkill name requirements:")
-        print("  - Hyphen-case identifier (e.g., 'data-analyzer')")
-        print("  - Lowercase letters, digits, and hyphens only")
-        print("  - Max 40 characters")
-        print("  - Must match directory name exactly")
-        print("\nExamples:")
-        print("  init_skill.py my-new-skill --path skills/public")
-        print("  init_skill.py my-api-helper --path skills/private")
-        print("  init_skill.py custom-skill --path /custom/location")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(
+        description="Create a new skill from the template or from an existing skill.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""Skill name requirements:
+  - Hyphen-case identifier (e.g., 'data-analyzer')
+  - Lowercase letters, digits, and hyphens only
+  - Max 40 characters
+  - Must match directory name exactly
+
+Examples:
+  init_skill.py my-new-skill --path skills/public
+  init_skill.py my-api-helper --path skills/private
+  init_skill.py custom-skill --path /custom/location
+  init_skill.py pdf-forms --path skills/public --from skills/public/pdf"""
+    )
+    parser.add_argument('skill_name', help="name of the new skill")
+    parser.add_argument('--path', required=True, help="directory to create the skill in")
+    parser.add_argument('--from', dest='source', help="existing skill to clone instead of the template")
+    parser.add_argument('--link', action='store_true',
+                        help="with --from, hardlink files that cannot be reflinked instead of copying them")
+    args = parser.parse_args()
 
-    skill_name = sys.argv[1]
-    path = sys.argv[3]
+    skill_name = args.skill_name
+    path = args.path
 
     print(f"🚀 Initializing skill: {skill_name}")
     print(f"   Location: {path}")
+    if args.source:
+        print(f"   From: {args.source}")
     print()
 
-    result = init_skill(skill_name, path)
+    if args.source:
+        result = clone_skill(skill_name, path, args.source, args.link)
+    else:
+        result = init_skill(skill_name, path)
 
     if result:
         sys.exit(0)
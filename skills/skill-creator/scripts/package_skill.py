@@ -3,26 +3,286 @@
 Skill Packager - Creates a distributable .skill file of a skill folder
 
 Usage:
-    python utils/package_skill.py <path/to/skill-folder> [output-directory]
+    python utils/package_skill.py <path/to/skill-folder> [output-directory] [--force]
+                                  [--method deflate|bzip2|lzma|zstd] [--level N]
+    python utils/package_skill.py --batch <skills-root> [output-directory] [-j N]
 
 Example:
     python utils/package_skill.py skills/public/my-skill
     python utils/package_skill.py skills/public/my-skill ./dist
+
+Archives are reproducible: entries are sorted, timestamps are fixed and
+permissions are normalized, so identical skill contents always produce
+identical .skill bytes. A <name>.skill.manifest.json written next to the
+archive records the content hashes; packaging an unchanged skill again is
+a no-op unless --force is given. When only some files changed, entries whose
+content, mode and compression settings match the manifest are copied from the
+previous archive as already-compressed bytes and only the changed files are
+compressed again; the result is byte-identical to a full rebuild.
+
+Already-compressed formats (images, fonts, archives, media) are stored
+without recompression; everything else uses --method at --level. --level is
+ignored for lzma, which zipfile always runs at its default preset. A summary
+of bytes saved and time spent per file type is printed after packaging.
+
+--batch finds every folder containing a SKILL.md under a root, validates and
+packages them across a process pool, writes index.json (name, hash, size,
+validation status) to the output directory and exits non-zero if any skill
+fails.
 """
 
+import io
+import os
 import sys
+import json
+import time
+import shutil
+import struct
+import hashlib
 import zipfile
+import argparse
+from contextlib import redirect_stdout
 from pathlib import Path
-from quick_validate import validate_skill
+from quick_validate import find_skills, validate_skill
+
+# Fixed entry timestamp (the earliest a zip can store) for reproducible archives
+ZIP_EPOCH = (1980, 1, 1, 0, 0, 0)
+MANIFEST_SUFFIX = ".manifest.json"
+# Machine-local artifacts that would make otherwise identical skills differ
+EXCLUDED_NAMES = {'__pycache__', '.DS_Store', 'Thumbs.db'}
+EXCLUDED_SUFFIXES = {'.pyc', '.pyo'}
+
+# Formats that are already compressed; deflating them again costs CPU and
+# can make them larger, so they are stored as-is
+STORED_SUFFIXES = {
+    '.png', '.jpg', '.jpeg', '.gif', '.webp', '.avif', '.heic',
+    '.woff', '.woff2',
+    '.zip', '.gz', '.tgz', '.bz2', '.xz', '.zst', '.7z', '.rar', '.skill', '.jar',
+    '.docx', '.xlsx', '.pptx', '.odt', '.ods', '.odp', '.epub',
+    '.mp3', '.mp4', '.m4a', '.mov', '.webm', '.ogg', '.opus', '.flac',
+}
+
+COMPRESSION_METHODS = {
+    'deflate': zipfile.ZIP_DEFLATED,
+    'bzip2': zipfile.ZIP_BZIP2,
+    'lzma': zipfile.ZIP_LZMA,
+}
+if hasattr(zipfile, 'ZIP_ZSTANDARD'):  # Python 3.14+
+    COMPRESSION_METHODS['zstd'] = zipfile.ZIP_ZSTANDARD
+
+DEFAULT_METHOD = 'deflate'
+DEFAULT_LEVEL = 6
+# zipfile's LZMA compressor has no level setting
+METHODS_WITHOUT_LEVEL = {'lzma'}
+
+# Local file header: fixed part, then file name and extra field lengths at offset 26
+LOCAL_HEADER_SIZE = 30
+
+
+def file_sha256(path):
+    """SHA-256 of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def collect_files(skill_path):
+    """
+    List the files to package with their archive names, sorted by archive name.
+
+    Returns:
+        List of (file_path, arcname, mode) where mode is 0o755 or 0o644
+    """
+    files = []
+    for file_path in skill_path.rglob('*'):
+        relative = file_path.relative_to(skill_path)
+        if any(part in EXCLUDED_NAMES for part in relative.parts) or file_path.suffix in EXCLUDED_SUFFIXES:
+            continue
+        if file_path.is_file():
+            # Calculate the relative path within the zip
+            arcname = file_path.relative_to(skill_path.parent).as_posix()
+            mode = 0o755 if file_path.stat().st_mode & 0o111 else 0o644
+            files.append((file_path, arcname, mode))
+    files.sort(key=lambda entry: entry[1])
+    return files
+
+
+def effective_level(method, level):
+    """The level that actually applies to method (None where it is ignored)."""
+    return None if method in METHODS_WITHOUT_LEVEL else level
+
+
+def compression_for(arcname, method=DEFAULT_METHOD, level=DEFAULT_LEVEL):
+    """Return (compress_type, level) for one archive entry."""
+    if Path(arcname).suffix.lower() in STORED_SUFFIXES:
+        return zipfile.ZIP_STORED, None
+    return COMPRESSION_METHODS[method], effective_level(method, level)
 
 
-def package_skill(skill_path, output_dir=None):
+def content_manifest(skill_name, files, method=DEFAULT_METHOD, level=DEFAULT_LEVEL):
+    """Per-file hashes plus a tree hash over names, modes, contents and compression policy."""
+    level = effective_level(method, level)
+    tree = hashlib.sha256()
+    tree.update(f"compression\0{method}\0{level}\n".encode('utf-8'))
+    hashes = {}
+    for file_path, arcname, mode in files:
+        file_hash = file_sha256(file_path)
+        hashes[arcname] = file_hash
+        tree.update(f"{arcname}\0{mode:o}\0{file_hash}\n".encode('utf-8'))
+    return {"skill": skill_name, "tree_sha256": tree.hexdigest(), "files": hashes,
+            "compression": {"method": method, "level": level}}
+
+
+def previous_build(skill_filename, manifest_path):
+    """
+    The manifest of the existing archive, if the archive still matches it.
+
+    Returns:
+        The previous manifest dict, or None if there is no trustworthy build
+    """
+    if not skill_filename.exists() or not manifest_path.exists():
+        return None
+    try:
+        previous = json.loads(manifest_path.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(previous, dict) or previous.get("archive_sha256") != file_sha256(skill_filename):
+        return None
+    return previous
+
+
+def reusable_entries(previous, manifest):
+    """Archive names whose previous entry can be copied unchanged into the new archive."""
+    if not previous or previous.get("compression") != manifest["compression"]:
+        return set()
+    old_files = previous.get("files") or {}
+    return {arcname for arcname, file_hash in manifest["files"].items() if old_files.get(arcname) == file_hash}
+
+
+def needs_zip64(file_size):
+    """Whether an entry of this size is written with ZIP64 headers (zipfile.write's margin)."""
+    # zipf.open(..., 'w') does not know the size up front and refuses to
+    # grow past 2 GiB unless ZIP64 is forced
+    return file_size * 1.05 > zipfile.ZIP64_LIMIT
+
+
+def copy_raw_entry(zipf, old_zip, old_info):
+    """
+    Append an entry of old_zip to zipf without decompressing it.
+
+    The local header is rebuilt from the central directory record, which
+    holds the same fields zipfile wrote when the entry was first compressed,
+    and the compressed bytes are copied as they are.
+    """
+    info = old_info
+    # Read back from the central directory, where zipfile puts the ZIP64
+    # record; FileHeader() and the new central directory add their own
+    info.extra = b''
+    old_zip.fp.seek(old_info.header_offset)
+    header = old_zip.fp.read(LOCAL_HEADER_SIZE)
+    name_length, extra_length = struct.unpack('<HH', header[26:30])
+    old_zip.fp.seek(old_info.header_offset + LOCAL_HEADER_SIZE + name_length + extra_length)
+
+    info.header_offset = zipf.fp.tell()
+    zipf.fp.write(info.FileHeader(zip64=needs_zip64(info.file_size)))
+    remaining = info.compress_size
+    while remaining:
+        chunk = old_zip.fp.read(min(remaining, 1 << 20))
+        if not chunk:
+            raise zipfile.BadZipFile(f"Truncated entry in previous archive: {info.filename}")
+        zipf.fp.write(chunk)
+        remaining -= len(chunk)
+    zipf.filelist.append(info)
+    zipf.NameToInfo[info.filename] = info
+    zipf.start_dir = zipf.fp.tell()
+
+
+def write_archive(skill_filename, files, method=DEFAULT_METHOD, level=DEFAULT_LEVEL, reuse=(), previous_path=None):
+    """
+    Write a reproducible zip: sorted entries, fixed timestamps, normalized modes.
+
+    Entries named in reuse are copied from the archive at previous_path
+    (which the caller has checked against its manifest) instead of being
+    compressed again.
+
+    Returns:
+        Dict of file type -> {"files", "bytes", "compressed", "seconds", "reused"}
+    """
+    stats = {}
+    tmp_filename = skill_filename.with_name(skill_filename.name + '.tmp')
+    old_zip = zipfile.ZipFile(previous_path) if reuse else None
+    try:
+        with zipfile.ZipFile(tmp_filename, 'w') as zipf:
+            for file_path, arcname, mode in files:
+                info = zipfile.ZipInfo(arcname, date_time=ZIP_EPOCH)
+                info.create_system = 3  # Unix, so the mode bits below are honoured everywhere
+                info.external_attr = (0o100000 | mode) << 16
+                info.compress_type, entry_level = compression_for(arcname, method, level)
+
+                started = time.perf_counter()
+                old_info = old_zip.NameToInfo.get(arcname) if old_zip and arcname in reuse else None
+                if (old_info is not None and old_info.external_attr == info.external_attr
+                        and old_info.compress_type == info.compress_type):
+                    copy_raw_entry(zipf, old_zip, old_info)
+                    info = old_info
+                    reused = True
+                else:
+                    if entry_level is not None:
+                        # Renamed to compress_level in Python 3.13
+                        if hasattr(info, 'compress_level'):
+                            info.compress_level = entry_level
+                        else:
+                            info._compresslevel = entry_level
+                    with open(file_path, 'rb') as src, \
+                            zipf.open(info, 'w', force_zip64=needs_zip64(os.fstat(src.fileno()).st_size)) as dst:
+                        shutil.copyfileobj(src, dst, 1 << 20)
+                    reused = False
+                elapsed = time.perf_counter() - started
+
+                file_type = Path(arcname).suffix.lower() or '(none)'
+                entry = stats.setdefault(file_type, {"files": 0, "bytes": 0, "compressed": 0,
+                                                     "seconds": 0.0, "reused": 0})
+                entry["files"] += 1
+                entry["bytes"] += info.file_size
+                entry["compressed"] += info.compress_size
+                entry["seconds"] += elapsed
+                entry["reused"] += reused
+                stored = " (stored)" if info.compress_type == zipfile.ZIP_STORED else ""
+                print(f"  {'Reused' if reused else 'Added'}: {arcname}{stored}")
+    except BaseException:
+        tmp_filename.unlink(missing_ok=True)
+        raise
+    finally:
+        if old_zip is not None:
+            old_zip.close()
+    tmp_filename.replace(skill_filename)
+    return stats
+
+
+def print_compression_summary(stats):
+    """Print time spent and bytes saved per file type."""
+    print(f"\n  {'type':<10} {'files':>5} {'reused':>6} {'bytes':>12} {'packed':>12} {'saved':>12} {'ms':>8}")
+    for file_type in sorted(stats, key=lambda t: stats[t]["bytes"], reverse=True):
+        entry = stats[file_type]
+        saved = entry["bytes"] - entry["compressed"]
+        print(f"  {file_type:<10} {entry['files']:>5} {entry['reused']:>6} {entry['bytes']:>12,} "
+              f"{entry['compressed']:>12,} {saved:>12,} {entry['seconds'] * 1000:>8.1f}")
+
+
+def package_skill(skill_path, output_dir=None, force=False, method=DEFAULT_METHOD, level=DEFAULT_LEVEL,
+                  validate=True):
     """
     Package a skill folder into a .skill file.
 
     Args:
         skill_path: Path to the skill folder
         output_dir: Optional output directory for the .skill file (defaults to current directory)
+        force: Rebuild the archive even if the manifest says it is up to date
+        method: Compression for compressible files ('deflate', 'bzip2', 'lzma', or 'zstd' on Python 3.14+)
+        level: Compression level for that method (ignored for lzma); already-compressed formats are always stored
+        validate: Run validate_skill first (batch mode validates separately)
 
     Returns:
         Path to the created .skill file, or None if error
@@ -45,13 +305,14 @@ def package_skill(skill_path, output_dir=None):
         return None
 
     # Run validation before packaging
-    print("🔍 Validating skill...")
-    valid, message = validate_skill(skill_path)
-    if not valid:
-        print(f"❌ Validation failed: {message}")
-        print("   Please fix the validation errors before packaging.")
-        return None
-    print(f"✅ {message}\n")
+    if validate:
+        print("🔍 Validating skill...")
+        valid, message = validate_skill(skill_path)
+        if not valid:
+            print(f"❌ Validation failed: {message}")
+            print("   Please fix the validation errors before packaging.")
+            return None
+        print(f"✅ {message}\n")
 
     # Determine output location
     skill_name = skill_path.name
@@ -62,19 +323,28 @@ def package_skill(skill_path, output_dir=None):
         output_path = Path.cwd()
 
     skill_filename = output_path / f"{skill_name}.skill"
+    manifest_path = skill_filename.with_name(skill_filename.name + MANIFEST_SUFFIX)
 
     # Create the .skill file (zip format)
     try:
-        with zipfile.ZipFile(skill_filename, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            # Walk through the skill directory
-            for file_path in skill_path.rglob('*'):
-                if file_path.is_file():
-                    # Calculate the relative path within the zip
-                    arcname = file_path.relative_to(skill_path.parent)
-                    zipf.write(file_path, arcname)
-                    print(f"  Added: {arcname}")
+        files = collect_files(skill_path)
+        manifest = content_manifest(skill_name, files, method, level)
+
+        previous = None if force else previous_build(skill_filename, manifest_path)
+        if previous and previous.get("tree_sha256") == manifest["tree_sha256"]:
+            print(f"✅ Up to date, nothing to do: {skill_filename}")
+            print(f"   Content hash: {manifest['tree_sha256']}")
+            return skill_filename
+
+        stats = write_archive(skill_filename, files, method, level,
+                              reusable_entries(previous, manifest), skill_filename)
+        print_compression_summary(stats)
+
+        manifest["archive_sha256"] = file_sha256(skill_filename)
+        manifest_path.write_text(json.dumps(manifest, indent=2, sort_keys=True) + "\n", encoding='utf-8')
 
         print(f"\n✅ Successfully packaged skill to: {skill_filename}")
+        print(f"   Archive hash: {manifest['archive_sha256']}")
         return skill_filename
 
     except Exception as e:
@@ -82,23 +352,135 @@ def package_skill(skill_path, output_dir=None):
         return None
 
 
+def package_one(skill_path, output_dir, force, method, level):
+    """
+    Validate and package one skill for batch mode, capturing its output.
+
+    Runs in a worker process, so it only takes and returns picklable values.
+
+    Returns:
+        Dict for the batch index, plus the captured log under "log"
+    """
+    skill_path = Path(skill_path)
+    skill_filename = Path(output_dir) / f"{skill_path.name}.skill"
+    manifest_path = skill_filename.with_name(skill_filename.name + MANIFEST_SUFFIX)
+    before = skill_filename.stat().st_mtime_ns if skill_filename.exists() else None
+    record = {"name": skill_path.name, "path": str(skill_path), "archive": None,
+              "sha256": None, "size": None}
+
+    log = io.StringIO()
+    with redirect_stdout(log):
+        try:
+            valid, message = validate_skill(skill_path)
+        except Exception as e:
+            valid, message = False, f"Validation error: {e}"
+        record["valid"] = valid
+        record["validation"] = message
+        if not valid:
+            print(f"❌ Validation failed: {message}")
+            record["status"] = "invalid"
+        elif package_skill(skill_path, output_dir, force, method, level, validate=False):
+            manifest = json.loads(manifest_path.read_text(encoding='utf-8'))
+            record["archive"] = skill_filename.name
+            record["sha256"] = manifest["archive_sha256"]
+            record["size"] = skill_filename.stat().st_size
+            unchanged = before is not None and skill_filename.stat().st_mtime_ns == before
+            record["status"] = "up-to-date" if unchanged else "packaged"
+        else:
+            record["status"] = "error"
+    record["log"] = log.getvalue()
+    return record
+
+
+def package_batch(root, output_dir=None, force=False, method=DEFAULT_METHOD, level=DEFAULT_LEVEL, jobs=None):
+    """
+    Validate and package every skill under root across a process pool.
+
+    Writes index.json (name, hash, size, validation status) to the output
+    directory.
+
+    Returns:
+        True if every skill packaged successfully
+    """
+    output_path = Path(output_dir).resolve() if output_dir else Path.cwd()
+    output_path.mkdir(parents=True, exist_ok=True)
+    skills = find_skills(root, exclude=output_path)
+    if not skills:
+        print(f"❌ Error: No folders containing SKILL.md found under {root}")
+        return False
+
+    # Archives are named after the folder, so two skills with one name would collide
+    seen = {}
+    duplicates = []
+    for skill_dir in skills:
+        if skill_dir.name in seen:
+            duplicates.append(skill_dir)
+        else:
+            seen[skill_dir.name] = skill_dir
+    unique = [skill_dir for skill_dir in skills if skill_dir not in duplicates]
+
+    print(f"Found {len(skills)} skill(s) under {Path(root).resolve()}\n")
+    from concurrent.futures import ProcessPoolExecutor
+    records = []
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(package_one, str(skill_dir), str(output_path), force, method, level)
+                   for skill_dir in unique]
+        for future in futures:
+            record = future.result()
+            print(f"── {record['name']}: {record['status']}")
+            print(record.pop("log").rstrip())
+            print()
+            records.append(record)
+    for skill_dir in duplicates:
+        message = f"Duplicate skill name, already packaged from {seen[skill_dir.name]}"
+        print(f"❌ {skill_dir}: {message}")
+        records.append({"name": skill_dir.name, "path": str(skill_dir), "valid": False, "validation": message,
+                        "status": "error", "archive": None, "sha256": None, "size": None})
+
+    records.sort(key=lambda record: (record["name"], record["path"]))
+    index = {"skills": records, "compression": {"method": method, "level": level}}
+    index_path = output_path / "index.json"
+    tmp_path = index_path.with_name(index_path.name + '.tmp')
+    tmp_path.write_text(json.dumps(index, indent=2, sort_keys=True) + "\n", encoding='utf-8')
+    os.replace(tmp_path, index_path)
+
+    failed = [record for record in records if record["status"] in ("invalid", "error")]
+    print(f"Packaged {len(records) - len(failed)}/{len(records)} skill(s); index written to {index_path}")
+    for record in failed:
+        print(f"  ❌ {record['name']}: {record['validation'] if record['status'] == 'invalid' else record['status']}")
+    return not failed
+
+
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python utils/package_skill.py <path/to/skill-folder> [output-directory]")
-        print("\nExample:")
-        print("  python utils/package_skill.py skills/public/my-skill")
-        print("  python utils/package_skill.py skills/public/my-skill ./dist")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(
+        description="Package a skill folder into a distributable .skill file.",
+        epilog="Example:\n  python utils/package_skill.py skills/public/my-skill ./dist",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument('skill_path', help="path to the skill folder (with --batch: a root to search)")
+    parser.add_argument('output_dir', nargs='?', help="output directory (default: current directory)")
+    parser.add_argument('--force', action='store_true', help="rebuild even if the archive is up to date")
+    parser.add_argument('--method', choices=sorted(COMPRESSION_METHODS), default=DEFAULT_METHOD,
+                        help=f"compression for compressible files (default: {DEFAULT_METHOD})")
+    parser.add_argument('--level', type=int, default=DEFAULT_LEVEL,
+                        help=f"compression level for --method, ignored for lzma (default: {DEFAULT_LEVEL})")
+    parser.add_argument('--batch', action='store_true',
+                        help="package every folder containing a SKILL.md under skill_path")
+    parser.add_argument('-j', '--jobs', type=int, default=None,
+                        help="worker processes for --batch (default: CPU count)")
+    args = parser.parse_args()
 
-    skill_path = sys.argv[1]
-    output_dir = sys.argv[2] if len(sys.argv) > 2 else None
+    if args.batch:
+        print(f"📦 Packaging all skills under: {args.skill_path}")
+        ok = package_batch(args.skill_path, args.output_dir, args.force, args.method, args.level, args.jobs)
+        sys.exit(0 if ok else 1)
 
-    print(f"📦 Packaging skill: {skill_path}")
-    if output_dir:
-        print(f"   Output directory: {output_dir}")
+    print(f"📦 Packaging skill: {args.skill_path}")
+    if args.output_dir:
+        print(f"   Output directory: {args.output_dir}")
     print()
 
-    result = package_skill(skill_path, output_dir)
+    result = package_skill(args.skill_path, args.output_dir, args.force, args.method, args.level)
 
     if result:
         sys.exit(0)
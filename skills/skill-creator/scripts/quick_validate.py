@@ -1,95 +1,389 @@
 #!/usr/bin/env python3
 """
 Quick validation script for skills - minimal version
+
+Usage:
+    python quick_validate.py <skill_directory>
+    python quick_validate.py --batch <skills-root> [-j N] [--format text|json|junit]
+                             [--output FILE] [--no-cache]
+
+--batch validates every folder containing a SKILL.md under a root in a
+process pool and reports every violation of each skill, not just the first.
+Results are cached by SKILL.md mtime, size and hash, so revalidating an
+unchanged catalog does no parsing at all.
+
+Only the frontmatter of SKILL.md is read. Flat "key: value" frontmatter is
+parsed without PyYAML, and PyYAML and the process pool are imported only
+when needed, so importing this module stays cheap for package_skill.py.
 """
 
 import sys
 import os
 import re
-import yaml
+import json
+import hashlib
+import argparse
 from pathlib import Path
 
-def validate_skill(skill_path):
-    """Basic validation of a skill"""
-    skill_path = Path(skill_path)
+# Define allowed properties
+ALLOWED_PROPERTIES = {'name', 'description', 'license', 'allowed-tools', 'metadata'}
 
-    # Check SKILL.md exists
-    skill_md = skill_path / 'SKILL.md'
-    if not skill_md.exists():
-        return False, "SKILL.md not found"
+# A top-level "key: value" line, the only shape parse_flat_frontmatter accepts
+FLAT_LINE = re.compile(r'^([A-Za-z_][A-Za-z0-9_-]*):[ ]+([^\t]*)$')
+# Any top-level "key: anything" line, for parse_loose_frontmatter
+LOOSE_LINE = re.compile(r'^([A-Za-z_][A-Za-z0-9_-]*):(?:[ \t]+(.*))?$')
+# Leading characters that give a YAML scalar a special meaning
+YAML_INDICATORS = set('-?:,[]{}#&*!|>\'"%@`~+.0123456789')
+# Plain scalars YAML resolves to something other than a string
+YAML_NON_STRINGS = {'null', 'true', 'false', 'yes', 'no', 'on', 'off', 'y', 'n'}
 
-    # Read and validate frontmatter
-    content = skill_md.read_text()
-    if not content.startswith('---'):
-        return False, "No YAML frontmatter found"
+# Directories never searched for skills in batch mode
+SKIPPED_DIRS = {'.git', '__pycache__', 'node_modules'}
+
+# Bump when the rules change so cached results are not reused
+CACHE_VERSION = 2
+DEFAULT_CACHE = Path(os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache') / 'skill-creator' / 'quick_validate.json'
+
+
+def parse_flat_frontmatter(lines):
+    """
+    Parse frontmatter made only of "key: plain string" lines without YAML.
+
+    Returns:
+        The dict, or None if any line needs the real YAML parser (nesting,
+        quoting, block scalars, comments, or values YAML would not read as
+        a plain string)
+    """
+    frontmatter = {}
+    for line in lines:
+        if not line.strip():
+            continue
+        match = FLAT_LINE.match(line)
+        if not match:
+            return None
+        key, value = match.group(1), match.group(2).rstrip(' ')
+        if key.lower() in YAML_NON_STRINGS:
+            return None
+        if (not value or value[0] in YAML_INDICATORS or ': ' in value or ' #' in value
+                or value.endswith(':') or value.lower() in YAML_NON_STRINGS or not value.isprintable()):
+            return None
+        frontmatter[key] = value
+    return frontmatter
+
+
+def parse_loose_frontmatter(lines):
+    """
+    Parse frontmatter the forgiving way: every top-level "key: value" line
+    becomes a string, indented lines continue the previous value.
 
-    # Extract frontmatter
-    match = re.match(r'^---\n(.*?)\n---', content, re.DOTALL)
-    if not match:
-        return False, "Invalid frontmatter format"
+    Used for agent and command files, whose frontmatter is often not valid
+    YAML (e.g. "argument-hint: [path]... (optional)").
+    """
+    frontmatter = {}
+    key = None
+    for line in lines:
+        match = LOOSE_LINE.match(line)
+        if match:
+            key = match.group(1)
+            frontmatter[key] = (match.group(2) or '').strip()
+        elif key and line[:1] in (' ', '\t') and line.strip():
+            frontmatter[key] = f"{frontmatter[key]} {line.strip()}".strip()
+    return frontmatter
 
-    frontmatter_text = match.group(1)
+
+def read_frontmatter(skill_md, lenient=False):
+    """
+    Read and parse the frontmatter of a SKILL.md.
+
+    Only the lines up to the closing --- are read. Flat key/value frontmatter
+    is parsed directly; anything else goes through PyYAML, which is imported
+    on first use. With lenient=True, frontmatter that is not valid YAML is
+    read with parse_loose_frontmatter() instead of being reported.
+
+    Returns:
+        (frontmatter_dict, None) on success, (None, error_message) otherwise
+    """
+    lines = []
+    with open(skill_md) as f:
+        first = f.readline()
+        if not first.startswith('---'):
+            return None, "No YAML frontmatter found"
+        if first.rstrip('\n') != '---':
+            return None, "Invalid frontmatter format"
+        for line in f:
+            if line.startswith('---') and lines:
+                break
+            lines.append(line.rstrip('\n'))
+        else:
+            return None, "Invalid frontmatter format"
+
+    frontmatter = parse_flat_frontmatter(lines)
+    if frontmatter:
+        return frontmatter, None
 
     # Parse YAML frontmatter
+    import yaml
     try:
-        frontmatter = yaml.safe_load(frontmatter_text)
+        frontmatter = yaml.safe_load("\n".join(lines))
         if not isinstance(frontmatter, dict):
-            return False, "Frontmatter must be a YAML dictionary"
+            return None, "Frontmatter must be a YAML dictionary"
     except yaml.YAMLError as e:
-        return False, f"Invalid YAML in frontmatter: {e}"
+        if lenient:
+            return parse_loose_frontmatter(lines), None
+        return None, f"Invalid YAML in frontmatter: {e}"
+    return frontmatter, None
+
+
+def find_violations(skill_path):
+    """
+    Check a skill against every rule.
+
+    Returns:
+        List of violation messages, empty if the skill is valid. Problems that
+        prevent reading the frontmatter are reported alone.
+    """
+    skill_path = Path(skill_path)
 
-    # Define allowed properties
-    ALLOWED_PROPERTIES = {'name', 'description', 'license', 'allowed-tools', 'metadata'}
+    # Check SKILL.md exists
+    skill_md = skill_path / 'SKILL.md'
+    if not skill_md.exists():
+        return ["SKILL.md not found"]
+
+    # Read and validate frontmatter
+    frontmatter, error = read_frontmatter(skill_md)
+    if error:
+        return [error]
+
+    violations = []
 
     # Check for unexpected properties (excluding nested keys under metadata)
     unexpected_keys = set(frontmatter.keys()) - ALLOWED_PROPERTIES
     if unexpected_keys:
-        return False, (
+        violations.append(
             f"Unexpected key(s) in SKILL.md frontmatter: {', '.join(sorted(unexpected_keys))}. "
             f"Allowed properties are: {', '.join(sorted(ALLOWED_PROPERTIES))}"
         )
 
     # Check required fields
     if 'name' not in frontmatter:
-        return False, "Missing 'name' in frontmatter"
+        violations.append("Missing 'name' in frontmatter")
     if 'description' not in frontmatter:
-        return False, "Missing 'description' in frontmatter"
+        violations.append("Missing 'description' in frontmatter")
 
     # Extract name for validation
     name = frontmatter.get('name', '')
     if not isinstance(name, str):
-        return False, f"Name must be a string, got {type(name).__name__}"
+        violations.append(f"Name must be a string, got {type(name).__name__}")
+        name = ''
     name = name.strip()
     if name:
         # Check naming convention (hyphen-case: lowercase with hyphens)
         if not re.match(r'^[a-z0-9-]+$', name):
-            return False, f"Name '{name}' should be hyphen-case (lowercase letters, digits, and hyphens only)"
+            violations.append(f"Name '{name}' should be hyphen-case (lowercase letters, digits, and hyphens only)")
         if name.startswith('-') or name.endswith('-') or '--' in name:
-            return False, f"Name '{name}' cannot start/end with hyphen or contain consecutive hyphens"
+            violations.append(f"Name '{name}' cannot start/end with hyphen or contain consecutive hyphens")
         # Check name length (max 64 characters per spec)
         if len(name) > 64:
-            return False, f"Name is too long ({len(name)} characters). Maximum is 64 characters."
+            violations.append(f"Name is too long ({len(name)} characters). Maximum is 64 characters.")
 
     # Extract and validate description
     description = frontmatter.get('description', '')
     if not isinstance(description, str):
-        return False, f"Description must be a string, got {type(description).__name__}"
+        violations.append(f"Description must be a string, got {type(description).__name__}")
+        description = ''
     description = description.strip()
     if description:
         # Check for angle brackets
         if '<' in description or '>' in description:
-            return False, "Description cannot contain angle brackets (< or >)"
+            violations.append("Description cannot contain angle brackets (< or >)")
         # Check description length (max 1024 characters per spec)
         if len(description) > 1024:
-            return False, f"Description is too long ({len(description)} characters). Maximum is 1024 characters."
+            violations.append(
+                f"Description is too long ({len(description)} characters). Maximum is 1024 characters."
+            )
+
+    return violations
+
 
+def validate_skill(skill_path):
+    """Basic validation of a skill"""
+    violations = find_violations(skill_path)
+    if violations:
+        return False, violations[0]
     return True, "Skill is valid!"
 
-if __name__ == "__main__":
-    if len(sys.argv) != 2:
-        print("Usage: python quick_validate.py <skill_directory>")
-        sys.exit(1)
 
-    valid, message = validate_skill(sys.argv[1])
-    print(message)
-    sys.exit(0 if valid else 1)
+def find_skills(root, exclude=None):
+    """Return every folder under root that contains a SKILL.md, sorted."""
+    root = Path(root).resolve()
+    exclude = Path(exclude).resolve() if exclude else None
+    skills = set()
+    for skill_md in root.rglob('SKILL.md'):
+        skill_dir = skill_md.parent
+        if any(part in SKIPPED_DIRS for part in skill_dir.relative_to(root).parts):
+            continue
+        if exclude and (skill_dir == exclude or exclude in skill_dir.parents):
+            continue
+        skills.add(skill_dir)
+    return sorted(skills)
+
+
+def load_cache(cache_path):
+    try:
+        cache = json.loads(Path(cache_path).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(cache, dict) or cache.get('version') != CACHE_VERSION:
+        return {}
+    skills = cache.get('skills')
+    return skills if isinstance(skills, dict) else {}
+
+
+def save_cache(cache_path, entries):
+    cache_path = Path(cache_path)
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps({'version': CACHE_VERSION, 'skills': entries}, sort_keys=True),
+                            encoding='utf-8')
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass  # The cache is only an optimisation
+
+
+def cached_violations(entry, skill_md):
+    """
+    Return (violations, fingerprint) for a skill from its cache entry.
+
+    violations is None when the entry does not match the current SKILL.md.
+    A changed mtime alone does not invalidate the entry if the content hash
+    still matches. Malformed entries are treated as a miss.
+    """
+    try:
+        stat = skill_md.stat()
+    except OSError:
+        return None, None
+    fingerprint = {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}
+    if not (isinstance(entry, dict) and isinstance(entry.get('sha256'), str)
+            and isinstance(entry.get('violations'), list)):
+        entry = None
+    if entry and entry.get('mtime_ns') == stat.st_mtime_ns and entry.get('size') == stat.st_size:
+        fingerprint['sha256'] = entry['sha256']
+        return entry['violations'], fingerprint
+    fingerprint['sha256'] = hashlib.sha256(skill_md.read_bytes()).hexdigest()
+    if entry and entry['sha256'] == fingerprint['sha256']:
+        return entry['violations'], fingerprint
+    return None, fingerprint
+
+
+def validate_batch(root, jobs=None, cache_path=DEFAULT_CACHE):
+    """
+    Validate every skill under root, reusing cached results where possible.
+
+    Returns:
+        List of {"name", "path", "valid", "violations", "cached"} dicts, sorted by path
+    """
+    skills = find_skills(root)
+    cache = load_cache(cache_path) if cache_path else {}
+    results = {}
+    pending = {}
+    for skill_dir in skills:
+        key = str(skill_dir / 'SKILL.md')
+        violations, fingerprint = cached_violations(cache.get(key), skill_dir / 'SKILL.md')
+        if violations is None:
+            pending[skill_dir] = fingerprint
+        else:
+            results[skill_dir] = (violations, True)
+            cache[key] = dict(fingerprint, violations=violations)
+
+    if len(pending) > 1 and jobs != 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            checked = dict(zip(pending, pool.map(find_violations, pending)))
+    else:
+        checked = {skill_dir: find_violations(skill_dir) for skill_dir in pending}
+    for skill_dir, violations in checked.items():
+        results[skill_dir] = (violations, False)
+        if pending[skill_dir]:
+            cache[str(skill_dir / 'SKILL.md')] = dict(pending[skill_dir], violations=violations)
+
+    if cache_path:
+        # Forget skills under this root that no longer exist
+        root_prefix = str(Path(root).resolve()) + os.sep
+        current = {str(skill_dir / 'SKILL.md') for skill_dir in skills}
+        save_cache(cache_path, {key: entry for key, entry in cache.items()
+                                if key in current or not key.startswith(root_prefix)})
+
+    return [
+        {'name': skill_dir.name, 'path': str(skill_dir), 'valid': not results[skill_dir][0],
+         'violations': results[skill_dir][0], 'cached': results[skill_dir][1]}
+        for skill_dir in skills
+    ]
+
+
+def format_junit(results):
+    """Render batch results as a JUnit XML report, one test case per skill."""
+    from xml.etree import ElementTree
+
+    failures = sum(1 for result in results if not result['valid'])
+    suite = ElementTree.Element('testsuite', name='quick_validate', tests=str(len(results)),
+                                failures=str(failures), errors='0')
+    for result in results:
+        case = ElementTree.SubElement(suite, 'testcase', classname='skills', name=result['name'],
+                                      file=result['path'])
+        if not result['valid']:
+            failure = ElementTree.SubElement(case, 'failure', message=result['violations'][0])
+            failure.text = "\n".join(result['violations'])
+    if hasattr(ElementTree, 'indent'):  # Python 3.9+
+        ElementTree.indent(suite)
+    return ElementTree.tostring(suite, encoding='unicode', xml_declaration=True) + "\n"
+
+
+def format_text(results):
+    lines = []
+    for result in results:
+        if result['valid']:
+            lines.append(f"✅ {result['name']}")
+        else:
+            lines.append(f"❌ {result['name']} ({result['path']})")
+            lines.extend(f"   - {violation}" for violation in result['violations'])
+    failed = sum(1 for result in results if not result['valid'])
+    cached = sum(1 for result in results if result['cached'])
+    lines.append(f"\n{len(results) - failed}/{len(results)} skill(s) valid ({cached} from cache)")
+    return "\n".join(lines) + "\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate a skill, or every skill under a folder.")
+    parser.add_argument('skill_path', help="skill folder (with --batch: a root to search)")
+    parser.add_argument('--batch', action='store_true',
+                        help="validate every folder containing a SKILL.md under skill_path")
+    parser.add_argument('-j', '--jobs', type=int, default=None,
+                        help="worker processes for --batch (default: CPU count)")
+    parser.add_argument('--format', choices=('text', 'json', 'junit'), default='text',
+                        help="--batch report format (default: text)")
+    parser.add_argument('--output', help="write the --batch report to this file instead of stdout")
+    parser.add_argument('--no-cache', action='store_true', help="ignore and do not update the result cache")
+    args = parser.parse_args()
+
+    if not args.batch:
+        valid, message = validate_skill(args.skill_path)
+        print(message)
+        sys.exit(0 if valid else 1)
+
+    results = validate_batch(args.skill_path, args.jobs, None if args.no_cache else DEFAULT_CACHE)
+    if args.format == 'json':
+        report = json.dumps(results, indent=2) + "\n"
+    elif args.format == 'junit':
+        report = format_junit(results)
+    else:
+        report = format_text(results)
+    if args.output:
+        Path(args.output).write_text(report, encoding='utf-8')
+    else:
+        sys.stdout.write(report)
+    sys.exit(0 if results and all(result['valid'] for result in results) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+"""
+Status line for Claude Code
+
+Cross-platform replacement for statusline.ps1 with the same output:
+project, model, git branch with dirty/ahead/behind markers, and remaining
+context. All git information comes from a single
+`git status --porcelain=v2 --branch` call.
+
+Results are cached per repository in ~/.claude/.statusline_cache.json (an
+LRU of STATUSLINE_CACHE_SIZE repositories, default 16). An entry stays valid
+while the mtimes of .git/index, HEAD, the current branch ref, the upstream
+ref and packed-refs are unchanged, so commits, checkouts, staging and
+fetches show up on the next render. Working-tree edits do not touch any of
+those files, so entries are also refreshed once they are older than
+STATUSLINE_MAX_AGE seconds (default 30).
+
+git runs under a hard time budget (STATUSLINE_GIT_TIMEOUT_MS, default 500).
+When it is exceeded the last known state is shown, or no git segment at all,
+so the prompt never hangs.
+
+Session usage (turns, tool calls, tokens) comes from the transcript named in
+the payload. Each refresh reads only the bytes appended since the previous
+one (at most 32 MiB), from an offset stored with the running totals in
+~/.claude/.statusline_sessions.json, so its cost does not grow with the
+transcript. A single line longer than that is skipped rather than reread.
+STATUSLINE_USAGE=0 hides the segment.
+"""
+
+import os
+import sys
+import json
+import time
+import tempfile
+import subprocess
+from pathlib import Path
+
+CACHE_FILE = Path.home() / ".claude" / ".statusline_cache.json"
+CACHE_SIZE = int(os.environ.get("STATUSLINE_CACHE_SIZE") or 16)
+MAX_AGE = float(os.environ.get("STATUSLINE_MAX_AGE") or 30)
+GIT_TIMEOUT = float(os.environ.get("STATUSLINE_GIT_TIMEOUT_MS") or 500) / 1000
+
+SESSIONS_FILE = Path.home() / ".claude" / ".statusline_sessions.json"
+SESSIONS_SIZE = 32
+SHOW_USAGE = os.environ.get("STATUSLINE_USAGE", "1").strip().lower() not in ("0", "false", "no", "off")
+READ_CHUNK = 8 << 20
+# Bytes of transcript folded in per refresh; a resumed long session catches up over a few refreshes
+READ_LIMIT = 32 << 20
+USAGE_KEYS = ("input_tokens", "cache_creation_input_tokens", "cache_read_input_tokens", "output_tokens")
+
+ESC = "\x1b"
+FOLDER = "\U0001F4C1"
+ROBOT = "\U0001F916"
+BRANCH = "\U0001F33F"
+CHART = "\U0001F4CA"
+UP = "↑"
+DOWN = "↓"
+
+
+def find_repo(directory):
+    """Return (worktree_root, git_dir) for the repository containing directory, or None."""
+    path = Path(directory)
+    for candidate in (path, *path.parents):
+        dot_git = candidate / ".git"
+        if dot_git.is_dir():
+            return candidate, dot_git
+        if dot_git.is_file():
+            # Worktrees and submodules: ".git" is a file holding "gitdir: <path>"
+            try:
+                content = dot_git.read_text(encoding="utf-8").strip()
+            except OSError:
+                return None
+            if content.startswith("gitdir:"):
+                git_dir = Path(content[len("gitdir:"):].strip())
+                return candidate, git_dir if git_dir.is_absolute() else candidate / git_dir
+    return None
+
+
+def common_dir(git_dir):
+    """Directory holding refs and packed-refs (differs from git_dir for linked worktrees)"""
+    try:
+        relative = (git_dir / "commondir").read_text(encoding="utf-8").strip()
+    except OSError:
+        return git_dir
+    path = Path(relative)
+    return path if path.is_absolute() else git_dir / path
+
+
+def mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def fingerprint(git_dir, branch=None, upstream=None):
+    """mtimes of every file whose change can alter the git segment"""
+    refs_dir = common_dir(git_dir)
+    return [
+        mtime(git_dir / "index"),
+        mtime(git_dir / "HEAD"),
+        mtime(refs_dir / "packed-refs"),
+        mtime(refs_dir / "refs" / "heads" / branch) if branch else None,
+        mtime(refs_dir / "refs" / "remotes" / upstream) if upstream else None,
+    ]
+
+
+def parse_status(output):
+    """Turn porcelain v2 output into (branch_name, upstream, git_status) for the status line"""
+    head = oid = upstream = None
+    ahead = behind = 0
+    dirty = False
+    for line in output.splitlines():
+        if line.startswith("# branch.head "):
+            head = line[len("# branch.head "):]
+        elif line.startswith("# branch.oid "):
+            oid = line[len("# branch.oid "):]
+        elif line.startswith("# branch.upstream "):
+            upstream = line[len("# branch.upstream "):]
+        elif line.startswith("# branch.ab "):
+            a, b = line[len("# branch.ab "):].split()
+            ahead, behind = int(a), -int(b)
+        elif line and not line.startswith("#"):
+            dirty = True
+
+    if head and head != "(detached)":
+        branch = head
+    elif oid and oid != "(initial)":
+        branch = f"HEAD@{oid[:7]}"
+    else:
+        return None, None, ""
+
+    status = "*" if dirty else ""
+    if ahead > 0:
+        status += f"{UP}{ahead}"
+    if behind > 0:
+        status += f"{DOWN}{behind}"
+    return branch, upstream, status
+
+
+def run_git_status(root):
+    """One bounded git call; returns its stdout or None on failure or timeout"""
+    try:
+        result = subprocess.run(
+            # --no-optional-locks: never rewrite the index, which would
+            # invalidate our own cache and contend with the user's git
+            ["git", "--no-optional-locks", "-C", str(root), "status", "--porcelain=v2", "--branch"],
+            stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+            timeout=GIT_TIMEOUT,
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    if result.returncode != 0:
+        return None
+    return result.stdout.decode("utf-8", errors="replace")
+
+
+def load_cache(path=CACHE_FILE):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+        return cache if isinstance(cache, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def save_cache(cache, path=CACHE_FILE):
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f"{path.name}.", suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(cache, f)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass  # A cache we cannot write only costs recomputing it next time
+
+
+def git_segment(directory):
+    """(branch, status) for the repository containing directory, or (None, "")"""
+    repo = find_repo(directory)
+    if repo is None:
+        return None, ""
+    root, git_dir = repo
+    key = str(root)
+
+    cache = load_cache()
+    entry = cache.get(key)
+    if (entry and time.time() - entry["time"] < MAX_AGE
+            and entry["fingerprint"] == fingerprint(git_dir, entry["branch"], entry["upstream"])):
+        if list(cache)[-1] != key:
+            # Mark as most recently used
+            cache[key] = cache.pop(key)
+            save_cache(cache)
+        return entry["branch"], entry["status"]
+
+    output = run_git_status(root)
+    if output is None:
+        # Over budget or git failed: show the last known state rather than nothing
+        return (entry["branch"], entry["status"]) if entry else (None, "")
+
+    branch, upstream, status = parse_status(output)
+    cache.pop(key, None)
+    cache[key] = {
+        "time": time.time(),
+        "fingerprint": fingerprint(git_dir, branch if branch and not branch.startswith("HEAD@") else None,
+                                   upstream),
+        "branch": branch,
+        "upstream": upstream,
+        "status": status,
+    }
+    while len(cache) > CACHE_SIZE:
+        cache.pop(next(iter(cache)))
+    save_cache(cache)
+    return branch, status
+
+
+def new_totals():
+    return {"turns": 0, "tool_calls": 0, **{key: 0 for key in USAGE_KEYS},
+            "last_message_id": None, "last_usage": None}
+
+
+def add_line(totals, line):
+    """Fold one transcript line into the running totals"""
+    try:
+        entry = json.loads(line)
+    except ValueError:
+        return
+    if not isinstance(entry, dict) or not isinstance(entry.get("message"), dict):
+        return
+    message = entry["message"]
+    content = message.get("content")
+
+    if entry.get("type") == "assistant":
+        if isinstance(content, list):
+            totals["tool_calls"] += sum(1 for block in content
+                                        if isinstance(block, dict) and block.get("type") == "tool_use")
+        usage = message.get("usage")
+        if isinstance(usage, dict):
+            usage = {key: usage.get(key) or 0 for key in USAGE_KEYS}
+            # One response is written as one line per content block, each
+            # repeating its usage; count the latest copy once
+            if message.get("id") and message.get("id") == totals["last_message_id"] and totals["last_usage"]:
+                for key in USAGE_KEYS:
+                    totals[key] -= totals["last_usage"][key]
+            for key in USAGE_KEYS:
+                totals[key] += usage[key]
+            totals["last_message_id"] = message.get("id")
+            totals["last_usage"] = usage
+
+    elif entry.get("type") == "user" and not entry.get("isMeta") and not entry.get("isSidechain"):
+        # Tool results come back as user lines too; only prompts are turns
+        if isinstance(content, str) or (isinstance(content, list) and not any(
+                isinstance(block, dict) and block.get("type") == "tool_result" for block in content)):
+            totals["turns"] += 1
+
+
+def valid_state(state):
+    """True if a cached session entry has the shape session_usage writes"""
+    if not isinstance(state, dict) or not isinstance(state.get("inode"), int):
+        return False
+    if not isinstance(state.get("offset"), int) or state["offset"] < 0:
+        return False
+    totals = state.get("totals")
+    if not isinstance(totals, dict) or not all(isinstance(totals.get(key), int)
+                                               for key in ("turns", "tool_calls", *USAGE_KEYS)):
+        return False
+    last_usage = totals.get("last_usage")
+    return last_usage is None or (isinstance(last_usage, dict)
+                                  and all(isinstance(last_usage.get(key), int) for key in USAGE_KEYS))
+
+
+def session_usage(transcript_path):
+    """Running totals for a transcript, reading only what was appended since the last call"""
+    try:
+        f = open(transcript_path, "rb")
+    except (OSError, TypeError):
+        return None
+    with f:
+        stat = os.fstat(f.fileno())
+        sessions = load_cache(SESSIONS_FILE)
+        key = str(transcript_path)
+        state = sessions.get(key)
+        if not valid_state(state) or state["inode"] != stat.st_ino or state["offset"] > stat.st_size:
+            # New, replaced, truncated or unreadable entry: start over
+            state = {"inode": stat.st_ino, "offset": 0, "totals": new_totals()}
+
+        if state["offset"] < stat.st_size:
+            f.seek(state["offset"])
+            pending = b""
+            read = 0
+            while read < READ_LIMIT:
+                chunk = f.read(READ_CHUNK)
+                if not chunk:
+                    break
+                state["offset"] += len(chunk)
+                read += len(chunk)
+                if state.get("skip_line"):
+                    # Still inside an over-long line dropped by an earlier refresh
+                    end = chunk.find(b"\n")
+                    if end == -1:
+                        continue
+                    chunk = chunk[end + 1:]
+                    state["skip_line"] = False
+                lines = (pending + chunk).split(b"\n")
+                # A trailing partial line is still being written; pick it up next time
+                pending = lines.pop()
+                for line in lines:
+                    if line.strip():
+                        add_line(state["totals"], line)
+            if len(pending) >= READ_LIMIT:
+                # One line filled a whole refresh; rereading it would never make progress
+                pending = b""
+                state["skip_line"] = True
+            state["offset"] -= len(pending)
+            sessions.pop(key, None)
+            sessions[key] = state
+            while len(sessions) > SESSIONS_SIZE:
+                sessions.pop(next(iter(sessions)))
+            save_cache(sessions, SESSIONS_FILE)
+        return state["totals"]
+
+
+def format_count(n):
+    if n >= 1_000_000:
+        return f"{n / 1_000_000:.1f}M"
+    if n >= 1000:
+        return f"{n / 1000:.1f}k"
+    return str(n)
+
+
+def usage_segment(data):
+    """Turns, tool calls, tokens and cost for the session, or None"""
+    totals = session_usage(data.get("transcript_path")) if data.get("transcript_path") else None
+    cost = (data.get("cost") or {}).get("total_cost_usd")
+    parts = []
+    if totals:
+        # Cache reads are re-sent context, not new work; they are tracked but not shown
+        tokens = totals["input_tokens"] + totals["cache_creation_input_tokens"] + totals["output_tokens"]
+        parts += [f"{totals['turns']} turns", f"{totals['tool_calls']} tools", f"{format_count(tokens)} tok"]
+    if isinstance(cost, (int, float)):
+        parts.append(f"${cost:.2f}")
+    return f"{CHART} {', '.join(parts)}" if parts else None
+
+
+def render(data):
+    model_name = (data.get("model") or {}).get("display_name") or "Claude"
+    workspace = data.get("workspace") or {}
+    current_dir = workspace.get("current_dir")
+    project_dir = workspace.get("project_dir")
+    used_pct = (data.get("context_window") or {}).get("used_percentage")
+
+    project_name = Path(project_dir or current_dir).name if (project_dir or current_dir) else "no-project"
+
+    components = [f"{FOLDER} {project_name}", f"{ROBOT} {model_name}"]
+
+    if current_dir:
+        branch, status = git_segment(current_dir)
+        if branch:
+            components.append(f"{BRANCH} {branch}{status}")
+
+    if SHOW_USAGE:
+        usage = usage_segment(data)
+        if usage:
+            components.append(usage)
+
+    if isinstance(used_pct, (int, float)):
+        pct = max(round(100 - used_pct), 0)
+        color = "32" if pct > 50 else "33" if pct > 20 else "31"
+        components.append(f"{ESC}[{color}m{pct}% Remaining{ESC}[0m")
+
+    return " | ".join(components)
+
+
+def main():
+    raw = sys.stdin.buffer.read()
+    if not raw.strip():
+        return 0
+    try:
+        data = json.loads(raw)
+    except ValueError:
+        return 0
+    line = render(data)
+    # Emojis need UTF-8 even where the console code page is something else
+    sys.stdout.buffer.write(line.encode("utf-8") + b"\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,19 +2,125 @@
 """
 Claude Code Documentation Sync Script
 Downloads all documentation from https://code.claude.com/docs/
+
+Usage:
+    sync-docs.py [page ...] [-j N] [--rate R] [--force] [--retries N] [--no-index] [--pack]
+                 [--docs-url URL]
+
+A manifest next to DOCS_DIR records each page's ETag, Last-Modified and
+body SHA-256, so a resync sends conditional requests and only rewrites
+pages whose content changed. The run ends by updating the full-text search
+index queried with docs_index.py and, with --pack, the single-file docs
+pack read with docs_pack.py.
 """
 
 import os
 import sys
+import json
+import hashlib
+import argparse
+import threading
+import collections
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import time
 import re
+import tempfile
 
 # Configuration
-BASE_URL = "https://code.claude.com/docs/en"
-LLMS_TXT_URL = "https://code.claude.com/docs/llms.txt"
+DOCS_ROOT_URL = "https://code.claude.com/docs"
+BASE_URL = f"{DOCS_ROOT_URL}/en"
+LLMS_TXT_URL = f"{DOCS_ROOT_URL}/llms.txt"
 DOCS_DIR = Path(__file__).parent / "docs"
+SERIAL_DELAY = 0.5  # Seconds between requests in the default serial mode
+MANIFEST_VERSION = 1
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# download_page outcomes; a failed download is reported as None
+DOWNLOADED = "downloaded"
+NOT_MODIFIED = "not modified"
+UNCHANGED = "unchanged"
+
+# Shared HTTP session, created by create_session() in main()
+SESSION = None
+
+def set_docs_root(root_url):
+    """Point the sync at another docs host, e.g. a local stand-in server for testing"""
+    global DOCS_ROOT_URL, BASE_URL, LLMS_TXT_URL
+    DOCS_ROOT_URL = root_url.rstrip("/")
+    BASE_URL = f"{DOCS_ROOT_URL}/en"
+    LLMS_TXT_URL = f"{DOCS_ROOT_URL}/llms.txt"
+
+class TransferStats:
+    """Thread-safe counters for the end-of-run transfer summary"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.responses = 0
+        self.wire_bytes = 0
+        self.body_bytes = 0
+        self.retries = 0
+
+    def record(self, response, body_bytes):
+        """Record a completed response whose `body_bytes`-long body has been read"""
+        with self.lock:
+            self.responses += 1
+            self.body_bytes += body_bytes
+            # Bytes actually received, before gzip decoding
+            self.wire_bytes += response.raw.tell() if response.raw is not None else body_bytes
+            history = getattr(getattr(response.raw, "retries", None), "history", None)
+            self.retries += len(history or ())
+
+STATS = TransferStats()
+
+def create_session(pool_size=10, retries=3, backoff=0.5):
+    """Create a keep-alive session with connection pooling and retry/backoff
+
+    Retries cover connection errors and the statuses in RETRY_STATUSES, with
+    exponential backoff that defers to the server's Retry-After header.
+    """
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset(["GET", "HEAD"]),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max(1, pool_size), max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    # requests already advertises gzip; make it explicit for the docs server
+    session.headers["Accept-Encoding"] = "gzip, deflate"
+    return session
+
+def connection_counts(session):
+    """Return (requests, connections) across the session's connection pools"""
+    total_requests = total_connections = 0
+    # The same adapter is mounted for http:// and https://
+    adapters = {id(adapter): adapter for adapter in session.adapters.values()}
+    for adapter in adapters.values():
+        pools = adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools[key]
+            total_requests += pool.num_requests
+            total_connections += pool.num_connections
+    return total_requests, total_connections
+
+def print_transfer_summary(session):
+    """Print bytes transferred and how well connections were reused"""
+    total_requests, total_connections = connection_counts(session)
+    print(f"Transferred: {STATS.wire_bytes:,} bytes on the wire "
+          f"({STATS.body_bytes:,} bytes of content) in {STATS.responses} responses")
+    if total_connections:
+        print(f"Connections: {total_requests} requests over {total_connections} connection(s) "
+              f"({total_requests / total_connections:.1f} requests per connection), "
+              f"{STATS.retries} retried")
 
 def ensure_dependencies():
     """Ensure required libraries are available"""
@@ -30,13 +136,14 @@ def discover_pages():
     """Discover all documentation pages by parsing llms.txt"""
     try:
         print("Discovering documentation pages from llms.txt...")
-        response = requests.get(LLMS_TXT_URL, timeout=30)
+        response = SESSION.get(LLMS_TXT_URL, timeout=30)
         response.raise_for_status()
+        STATS.record(response, len(response.content))
 
         # Parse llms.txt to extract page names
         # Format: - [Title](https://code.claude.com/docs/en/page-name.md): Description
         pages = []
-        pattern = re.compile(r'\[.*?\]\(https://code\.claude\.com/docs/en/([a-z0-9-]+)\.md\)')
+        pattern = re.compile(r'\[.*?\]\(' + re.escape(BASE_URL) + r'/([a-z0-9-]+)\.md\)')
 
         for line in response.text.splitlines():
             match = pattern.search(line)
@@ -52,59 +159,273 @@ def discover_pages():
         print(f"Error discovering pages: {e}")
         return None
 
-def download_page(page_name):
-    """Download a single documentation page directly as markdown"""
+def manifest_path():
+    """Location of the sync manifest, kept next to DOCS_DIR"""
+    return DOCS_DIR.parent / f"{DOCS_DIR.name}-manifest.json"
+
+def load_manifest():
+    """Load the per-page ETag/Last-Modified/SHA-256 manifest, or an empty one"""
+    try:
+        with open(manifest_path(), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if isinstance(manifest.get("pages"), dict):
+            return manifest
+    except (OSError, ValueError):
+        pass
+    return {"version": MANIFEST_VERSION, "pages": {}}
+
+def save_manifest(manifest):
+    """Write the manifest atomically so an interrupted sync cannot corrupt it"""
+    path = manifest_path()
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+def download_page(page_name, cached=None):
+    """Download a single documentation page directly as markdown
+
+    `cached` is the page's manifest entry from the previous sync. When given,
+    the request is conditional and the file is only rewritten if the body's
+    SHA-256 changed.
+
+    Returns (outcome, entry): outcome is DOWNLOADED when the file was
+    rewritten, NOT_MODIFIED on a 304, UNCHANGED when the body matched the
+    previous SHA-256, or None if the download failed, in which case entry
+    is None too.
+    """
     url = f"{BASE_URL}/{page_name}.md"  # Direct markdown URL
     output_file = DOCS_DIR / f"{page_name}.md"
-    
+
+    # Without the file on disk a 304 would leave nothing to keep
+    if cached and not output_file.exists():
+        cached = None
+
+    headers = {}
+    if cached:
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+    tmp_path = None
     try:
         print(f"Downloading: {page_name}")
-        response = requests.get(url, timeout=30)
-        response.raise_for_status()
-        
-        # Save the markdown content directly
-        content = response.text
-        
-        # Add a header with metadata
-        header = f"""<!-- 
+        response = SESSION.get(url, headers=headers, timeout=30, stream=True)
+        if response.status_code == 304 and not cached:
+            # Nothing on disk to keep, so a 304 (from the server or a proxy)
+            # must not leave an empty page behind: ask again unconditionally
+            STATS.record(response, 0)
+            response.close()
+            response = SESSION.get(url, headers={"Cache-Control": "no-cache"}, timeout=30, stream=True)
+        with response:
+            if response.status_code == 304:
+                STATS.record(response, 0)
+                if not cached:
+                    raise requests.HTTPError(f"304 Not Modified for an unconditional request: {url}",
+                                             response=response)
+                print(f"= Not modified: {page_name}")
+                return NOT_MODIFIED, cached
+            response.raise_for_status()
+
+            # Add a header with metadata
+            header = f"""<!-- 
 Source: {url}
 Downloaded: {time.strftime('%Y-%m-%d %H:%M:%S')}
 -->
 
 """
-        
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(header + content)
-            
+
+            # Stream the markdown into a temp file beside the target, header
+            # first, hashing the body as it arrives
+            digest = hashlib.sha256()
+            body_bytes = 0
+            fd, tmp_path = tempfile.mkstemp(dir=DOCS_DIR, prefix=f".{page_name}.", suffix=".tmp")
+            with os.fdopen(fd, 'wb') as f:
+                f.write(header.encode('utf-8'))
+                for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                    digest.update(chunk)
+                    body_bytes += len(chunk)
+                    f.write(chunk)
+            STATS.record(response, body_bytes)
+
+            entry = {
+                "url": url,
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "sha256": digest.hexdigest(),
+            }
+
+        if cached and cached.get("sha256") == entry["sha256"]:
+            print(f"= Unchanged: {page_name}")
+            return UNCHANGED, entry
+
+        # Atomic rename: readers see the old page or the new one, never a partial file
+        os.chmod(tmp_path, 0o644)  # mkstemp creates files owner-only
+        os.replace(tmp_path, output_file)
+        tmp_path = None
         print(f"+ Downloaded: {page_name}")
-        return True
-        
+        return DOWNLOADED, entry
+
     except requests.RequestException as e:
         print(f"- Failed to download {page_name}: {e}")
-        return False
+        return None, None
     except Exception as e:
         print(f"- Error processing {page_name}: {e}")
-        return False
+        return None, None
+    finally:
+        if tmp_path:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+
+class TokenBucket:
+    """Thread-safe token bucket allowing `rate` requests per second, bursting up to `capacity`"""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a request may be made"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+def sync_pages(pages, manifest, concurrency=1, rate=None, force=False):
+    """Download pages, record them in the manifest and return a Counter of outcomes.
+
+    With concurrency 1 and no rate, pages are fetched one at a time with a
+    fixed pause between requests. Otherwise a pool of `concurrency` workers
+    fetches pages, optionally throttled to `rate` requests per second.
+    With `force`, previous manifest entries are ignored. The Counter is
+    keyed by download_page outcome, with None counting failures.
+    """
+    cached = manifest["pages"]
+    previous = {} if force else dict(cached)
+    outcomes = collections.Counter()
+
+    def record(page, result):
+        outcome, entry = result
+        if outcome:
+            cached[page] = entry
+        outcomes[outcome] += 1
+
+    if concurrency <= 1 and rate is None:
+        for page in pages:
+            record(page, download_page(page, previous.get(page)))
+            time.sleep(SERIAL_DELAY)  # Be respectful to the server
+        return outcomes
+
+    bucket = TokenBucket(rate) if rate else None
+
+    def fetch(page):
+        if bucket:
+            bucket.acquire()
+        return download_page(page, previous.get(page))
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        # Results come back on this thread, so the manifest needs no lock
+        for page, result in zip(pages, pool.map(fetch, pages)):
+            record(page, result)
+    return outcomes
+
+def parse_args(argv=None):
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="Sync Claude Code documentation into DOCS_DIR.")
+    parser.add_argument("pages", nargs="*",
+                        help="specific pages to sync (default: every page listed in llms.txt)")
+    parser.add_argument("-j", "--concurrency", type=int, default=1,
+                        help="number of parallel downloads (default: 1, serial)")
+    parser.add_argument("--rate", type=float, default=None,
+                        help="maximum requests per second across all workers "
+                             f"(default: serial pause of {SERIAL_DELAY}s, unlimited when --concurrency > 1)")
+    parser.add_argument("--force", action="store_true",
+                        help="ignore the manifest and download every page again")
+    parser.add_argument("--retries", type=int, default=3,
+                        help="retries per request for connection errors and 429/5xx (default: 3)")
+    parser.add_argument("--no-index", action="store_true",
+                        help="skip updating the local search index (see docs_index.py)")
+    parser.add_argument("--pack", action="store_true",
+                        help="also write all pages into one compressed pack (see docs_pack.py)")
+    parser.add_argument("--docs-url", default=DOCS_ROOT_URL,
+                        help=f"docs root serving llms.txt and en/<page>.md (default: {DOCS_ROOT_URL})")
+    return parser.parse_args(argv)
+
+def update_search_index():
+    """Refresh the local full-text index for pages whose content changed"""
+    import docs_index
 
-def clean_docs_directory():
-    """Remove all existing documentation files"""
+    started = time.perf_counter()
+    try:
+        pages, sections, removed = docs_index.update_index(DOCS_DIR)
+    except Exception as e:
+        print(f"Warning: Could not update search index: {e}")
+        return
+    elapsed = (time.perf_counter() - started) * 1000
+    print(f"Search index: {pages} page(s) re-indexed ({sections} sections), "
+          f"{removed} removed in {elapsed:.0f} ms")
+
+def update_docs_pack():
+    """Rebuild the single-file compressed docs pack from DOCS_DIR"""
+    import docs_pack
+
+    try:
+        pages, sections, raw_bytes, packed_bytes = docs_pack.build_pack(DOCS_DIR)
+    except Exception as e:
+        print(f"Warning: Could not build docs pack: {e}")
+        return
+    print(f"Docs pack: {pages} pages ({sections} sections), {raw_bytes:,} -> {packed_bytes:,} bytes "
+          f"in {docs_pack.pack_path(DOCS_DIR)}")
+
+def prune_docs_directory(pages, manifest):
+    """Remove documentation files for pages no longer listed in llms.txt"""
+    keep = set(pages)
     if DOCS_DIR.exists():
+        # Temp files left behind by an interrupted download
+        for file in DOCS_DIR.glob(".*.tmp"):
+            try:
+                file.unlink()
+            except OSError:
+                pass
         for file in DOCS_DIR.glob("*.md"):
+            if file.stem in keep:
+                continue
             try:
                 file.unlink()
                 print(f"Removed old file: {file.name}")
             except Exception as e:
                 print(f"Warning: Could not remove {file.name}: {e}")
+    for page in list(manifest["pages"]):
+        if page not in keep:
+            del manifest["pages"][page]
 
 def main():
     """Main sync function"""
     if not ensure_dependencies():
         return 1
 
-    # Parse command line arguments
-    if len(sys.argv) > 1:
+    args = parse_args()
+    manifest = load_manifest()
+
+    global SESSION
+    set_docs_root(args.docs_url)
+    SESSION = create_session(pool_size=max(args.concurrency, 1), retries=args.retries)
+
+    if args.pages:
         # Sync specific pages
-        pages_to_sync = sys.argv[1:]
+        pages_to_sync = args.pages
         print(f"Syncing specific pages: {', '.join(pages_to_sync)}")
     else:
         # Discover all pages automatically
@@ -113,9 +434,9 @@ def main():
             print("Failed to discover pages automatically")
             return 1
 
-        # Clean old docs before full sync
-        print("\nCleaning old documentation files...")
-        clean_docs_directory()
+        # Remove docs for pages that have disappeared from llms.txt
+        print("\nRemoving documentation files for retired pages...")
+        prune_docs_directory(pages_to_sync, manifest)
 
     # Create docs directory
     DOCS_DIR.mkdir(exist_ok=True)
@@ -126,18 +447,25 @@ def main():
         print(f"\nSyncing {len(pages_to_sync)} Claude Code documentation pages...")
     print(f"Target directory: {DOCS_DIR}\n")
 
-    success_count = 0
     total_count = len(pages_to_sync)
+    try:
+        outcomes = sync_pages(pages_to_sync, manifest, args.concurrency, args.rate, args.force)
+    finally:
+        save_manifest(manifest)
 
-    for page in pages_to_sync:
-        if download_page(page):
-            success_count += 1
-        time.sleep(0.5)  # Be respectful to the server
-
-    print(f"\nSync complete! {success_count}/{total_count} pages downloaded")
+    failed_count = outcomes[None]
+    print(f"\nSync complete! {total_count} pages: {outcomes[DOWNLOADED]} downloaded, "
+          f"{outcomes[NOT_MODIFIED]} not modified, {outcomes[UNCHANGED]} skipped (content unchanged), "
+          f"{failed_count} failed")
     print(f"Files saved to: {DOCS_DIR}")
+    print_transfer_summary(SESSION)
+
+    if not args.no_index:
+        update_search_index()
+    if args.pack:
+        update_docs_pack()
 
-    return 0 if success_count == total_count else 1
+    return 0 if failed_count == 0 else 1
 
 if __name__ == "__main__":
     sys.exit(main())
\ No newline at end of file